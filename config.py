@@ -11,3 +11,33 @@ FILTERS = {
     "min_rating": 4.0,
     "availability": True  # Only in-stock
 }
+
+IMAGE_SETTINGS = {
+    "store_dir": "output/images",
+    "concurrency": 8,
+    "timeout": 15,  # seconds
+    "thumbnail_size": (160, 160),
+    "thumbnail_workers": 2
+}
+
+RECRAWL_SETTINGS = {
+    "store_path": "output/fingerprints.json",
+    "max_age_hours": 72,  # force a full crawl after this long
+    "unchanged_pages": 1  # pages to crawl when page 1 is unchanged
+}
+
+ARCHIVE_SETTINGS = {
+    "archive_dir": "output/archive"
+}
+
+DEDUPE_SETTINGS = {
+    "index_path": "output/listing_index.pkl",
+    "num_perm": 128,
+    "bands": 32,
+    "threshold": 0.6,  # estimated title similarity needed to match
+    "price_tolerance": 0.15  # max relative price difference
+}
+
+DELTA_SETTINGS = {
+    "feed_dir": "output/delta"
+}
@@ -0,0 +1,213 @@
+"""
+Offline load test: run the full AmazonScraper pipeline against a local mock storefront.
+"""
+
+import sys
+import math
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from scraper.storefront import MockStorefront
+
+
+def percentile(values, pct):
+    """Return the nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_job(store_url, search_term, args):
+    """Scrape one search term against the storefront and return its page log"""
+    from scraper.sites.amazon import AmazonScraper
+
+    scraper = AmazonScraper(args.chromedriver or None, prefetch=args.prefetch, base_url=store_url)
+    scraper.delay_range = tuple(args.delay)
+    scraper.headless = not args.headed
+    scraper.page_retries = args.page_retries
+    products = scraper.extract_products(args.pages, search_term)
+    return {"search_term": search_term, "products": len(products), "pages": scraper.page_log}
+
+
+def run_level(store, concurrency, args):
+    """Run jobs at one concurrency level and summarise them"""
+    terms = [f"load test {concurrency} {i}" for i in range(args.jobs or concurrency * 2)]
+    served_before = dict(store.stats)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        jobs = list(executor.map(lambda term: run_job(store.url, term, args), terms))
+    elapsed = time.perf_counter() - start
+
+    pages = [page for job in jobs for page in job["pages"]]
+    latencies = [page["seconds"] for page in pages if page["products"] is not None]
+    served = {key: store.stats[key] - served_before[key] for key in store.stats}
+
+    return {
+        "concurrency": concurrency,
+        "jobs": len(jobs),
+        "elapsed_seconds": round(elapsed, 1),
+        "pages_ok": len(latencies),
+        "pages_per_minute": round(len(latencies) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "pages_retried": sum(1 for page in pages if page["retries"]),
+        "pages_recovered": sum(1 for page in pages if page["retries"] and page["products"] is not None),
+        "pages_failed": sum(1 for page in pages if page["products"] is None),
+        "jobs_incomplete": sum(1 for job in jobs if len(job["pages"]) < args.pages or
+                               job["pages"][-1]["products"] is None),
+        "products": sum(job["products"] for job in jobs),
+        "served_errors": served["errors"],
+        "served_captchas": served["captchas"],
+    }
+
+
+def run_tabs_level(store, tabs, args):
+    """Scrape several terms in one browser with a given number of tabs and summarise the run"""
+    from scraper.sites.amazon import AmazonScraper
+
+    terms = [f"load test tabs {tabs} {i}" for i in range(args.jobs or tabs * 2)]
+    scraper = AmazonScraper(args.chromedriver or None, prefetch=args.prefetch, base_url=store.url)
+    scraper.delay_range = tuple(args.delay)
+    scraper.headless = not args.headed
+    scraper.page_retries = args.page_retries
+    products = scraper.extract_terms(terms, args.pages, max_tabs=tabs)
+
+    stats = scraper.last_run_stats
+    latencies = [page["seconds"] for page in scraper.page_log if page["products"] is not None]
+    return {
+        # --prefetch raises a single tab to two
+        "tabs": stats["tabs"],
+        "terms": len(terms),
+        "elapsed_seconds": stats["elapsed_seconds"],
+        "pages_ok": len(latencies),
+        "pages_per_minute": stats["pages_per_minute"],
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "peak_memory_mb": stats["peak_memory_mb"],
+        "pages_per_minute_per_gb": stats["pages_per_minute_per_gb"],
+        "pages_failed": sum(1 for page in scraper.page_log if page["products"] is None),
+        "products": len(products),
+    }
+
+
+def print_tabs_report(results):
+    """Print throughput per GB of browser memory for each tab count, relative to the first"""
+    print("\nMulti-tab results:")
+    print(f"{'tabs':>4} {'terms':>5} {'pages':>5} {'pages/min':>9} {'p50 s':>7} {'p95 s':>7} "
+          f"{'peak MB':>8} {'pages/min/GB':>12} {'vs first':>8} {'failed':>6}")
+    baseline = results[0]["pages_per_minute_per_gb"] if results else None
+    for r in results:
+        ratio = "-"
+        if baseline and r["pages_per_minute_per_gb"]:
+            ratio = f"{r['pages_per_minute_per_gb'] / baseline:.2f}x"
+        print(f"{r['tabs']:>4} {r['terms']:>5} {r['pages_ok']:>5} {r['pages_per_minute']:>9} "
+              f"{r['p50'] or '-':>7} {r['p95'] or '-':>7} {r['peak_memory_mb'] or '-':>8} "
+              f"{r['pages_per_minute_per_gb'] or '-':>12} {ratio:>8} {r['pages_failed']:>6}")
+    if results and not baseline:
+        print("Browser memory not measured (install psutil to enable)")
+
+
+def print_report(results):
+    """Print one line of load-test figures per concurrency level"""
+    print("\nLoad test results:")
+    print(f"{'conc':>4} {'jobs':>4} {'pages':>5} {'pages/min':>9} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} "
+          f"{'errors':>6} {'captcha':>7} {'retried':>7} {'recovered':>9} {'failed':>6} {'incomplete':>10}")
+    for r in results:
+        print(f"{r['concurrency']:>4} {r['jobs']:>4} {r['pages_ok']:>5} {r['pages_per_minute']:>9} "
+              f"{r['p50'] or '-':>7} {r['p95'] or '-':>7} {r['p99'] or '-':>7} "
+              f"{r['served_errors']:>6} {r['served_captchas']:>7} {r['pages_retried']:>7} "
+              f"{r['pages_recovered']:>9} {r['pages_failed']:>6} {r['jobs_incomplete']:>10}")
+
+
+def check_images(store, pages):
+    """Download the storefront's product images twice and check dedup and re-run behaviour"""
+    from scraper.images import ImageDownloader, print_image_stats
+
+    urls = [f"{store.url}/images/{product['asin']}.jpg"
+            for term in ("image check a", "image check b") for page in range(1, pages + 1)
+            for product in store.products(term, page)]
+    # Listing the first page twice exercises URL dedup
+    urls += urls[:store.products_per_page]
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        _, first = ImageDownloader(store_dir=store_dir).download(urls)
+        print_image_stats(first)
+        _, second = ImageDownloader(store_dir=store_dir).download(urls)
+        print_image_stats(second)
+
+    unique = len(set(urls))
+    checks = {
+        "duplicate URLs detected": first["duplicate_urls"] == len(urls) - unique,
+        "identical content stored once": first["duplicate_content"] > 0 and first["disk_bytes_saved"] > 0,
+        "every unique URL fetched once": first["downloaded"] + first["duplicate_content"] == unique,
+        "no failures": first["failed"] == 0 and second["failed"] == 0,
+        "re-run skips stored images": second["already_stored"] == unique and second["bytes_downloaded"] == 0,
+    }
+
+    print("\nImage pipeline check:")
+    for name, passed in checks.items():
+        print(f"  {'PASS' if passed else 'FAIL'}  {name}")
+    return all(checks.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the scraper against a local mock storefront')
+    parser.add_argument('-c', '--concurrency', type=int, nargs='+', default=[1, 2, 4],
+                        help='Concurrency levels to run (default: 1 2 4)')
+    parser.add_argument('-p', '--pages', type=int, default=3,
+                        help='Pages to scrape per job (default: 3)')
+    parser.add_argument('--jobs', type=int, default=0,
+                        help='Jobs per level, or terms per run with --tabs (default: twice the concurrency or tabs)')
+    parser.add_argument('--tabs', type=int, nargs='+', default=None,
+                        help='Run multi-term mode in one browser with these tab counts instead of concurrency '
+                             'levels, reporting pages/min per GB of browser memory (e.g. --tabs 1 2 4)')
+    parser.add_argument('--latency', type=float, nargs=2, default=[0.1, 0.5],
+                        help='Min and max page latency in seconds (default: 0.1 0.5)')
+    parser.add_argument('--asset-latency', type=float, nargs=2, default=[0.0, 0.0],
+                        help='Min and max image latency in seconds, for slow assets')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Share of page requests answered with HTTP 503')
+    parser.add_argument('--captcha-rate', type=float, default=0.0,
+                        help='Share of search requests answered with a CAPTCHA interstitial')
+    parser.add_argument('--delay', type=float, nargs=2, default=[0.5, 1.0],
+                        help='Politeness delay range used by the scraper (default: 0.5 1.0)')
+    parser.add_argument('--page-retries', type=int, default=1,
+                        help='Reloads of a page that came back without results (default: 1)')
+    parser.add_argument('--prefetch', action='store_true',
+                        help='Run the scraper in prefetch mode')
+    parser.add_argument('--headed', action='store_true',
+                        help='Show the browser windows instead of running headless')
+    parser.add_argument('--image-check', action='store_true',
+                        help='Only check the image downloader against the storefront (no browser needed)')
+    parser.add_argument('--chromedriver', type=str, default='',
+                        help='Path to chromedriver (default: chromedriver-win64/chromedriver.exe)')
+
+    args = parser.parse_args()
+
+    store = MockStorefront(latency=tuple(args.latency), asset_latency=tuple(args.asset_latency),
+                           error_rate=args.error_rate, captcha_rate=args.captcha_rate,
+                           total_pages=max(args.pages, 1) + 2)
+
+    with store:
+        print(f"Mock storefront running at {store.url}")
+        if args.image_check:
+            sys.exit(0 if check_images(store, args.pages) else 1)
+        if args.tabs:
+            results = [run_tabs_level(store, tabs, args) for tabs in args.tabs]
+        else:
+            results = [run_level(store, concurrency, args) for concurrency in args.concurrency]
+
+    if args.tabs:
+        print_tabs_report(results)
+    else:
+        print_report(results)
+
+
+if __name__ == "__main__":
+    main()
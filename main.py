@@ -12,7 +12,7 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import pandas as pd
 
 
-def scrape_amazon_products(search_url, num_pages=1):
+def scrape_amazon_products(search_url, num_pages=1, profiler=None):
     """
     Scrape Amazon products from multiple pages of search results
     """
@@ -45,6 +45,10 @@ def scrape_amazon_products(search_url, num_pages=1):
         # Set script timeout
         driver.set_script_timeout(30)
 
+        # Trace every WebDriver command when profiling
+        if profiler:
+            profiler.attach(driver)
+
         # Navigate to Amazon homepage first (helps avoid detection)
         driver.get("https://www.amazon.in/")
         time.sleep(random.uniform(2, 3))  # Random wait to mimic human behavior
@@ -56,6 +60,9 @@ def scrape_amazon_products(search_url, num_pages=1):
             print(f"\nScraping page {current_page} of {num_pages}")
             print(f"Navigating to: {current_url}")
 
+            if profiler:
+                profiler.start_page(f"page {current_page}")
+
             driver.get(current_url)
 
             # Add a longer wait time to ensure page loads completely
@@ -323,6 +330,9 @@ def scrape_amazon_products(search_url, num_pages=1):
             print(f"Successfully extracted {len(page_products)} products from page {current_page}")
             all_products.extend(page_products)
 
+            if profiler:
+                profiler.end_page()
+
             # Check if we've reached the requested number of pages
             if current_page >= num_pages:
                 break
@@ -382,6 +392,9 @@ def scrape_amazon_products(search_url, num_pages=1):
         return all_products  # Return any products we managed to collect before the error
 
     finally:
+        if profiler:
+            profiler.close()
+
         # Close the browser
         try:
             driver.quit()
@@ -389,6 +402,132 @@ def scrape_amazon_products(search_url, num_pages=1):
             pass
 
 
+def make_profiler(args, run_label=""):
+    """Create a DriverProfiler when --profile is set, otherwise None"""
+    if not args.profile:
+        return None
+    from scraper.profiling import DriverProfiler
+    return DriverProfiler(os.path.join(args.profile_dir, run_label))
+
+
+def make_fingerprints(args):
+    """Create a FingerprintStore when --skip-unchanged is set, otherwise None"""
+    if not args.skip_unchanged:
+        return None
+    from scraper.fingerprint import FingerprintStore
+    return FingerprintStore(args.fingerprint_store or None, max_age_hours=args.fingerprint_max_age,
+                            force_refresh=args.force_refresh)
+
+
+def make_lifecycle(scraper, args):
+    """Create a DriverLifecycle when --recycle-pages or --max-browser-mb is set, otherwise None"""
+    if not (args.recycle_pages or args.max_browser_mb):
+        return None
+    from scraper.lifecycle import DriverLifecycle
+    return DriverLifecycle(scraper, max_pages=args.recycle_pages, max_memory_mb=args.max_browser_mb,
+                           log_path=args.memory_log or None)
+
+
+def crawled_pages(page_log, search_term):
+    """Return the pages of a term that loaded successfully, from a scraper's page log"""
+    return {entry["page"] for entry in page_log
+            if entry["search_term"] == search_term and entry["products"] is not None}
+
+
+def scrape_with_scraper(search_term, args, profiler=None):
+    """
+    Scrape a single term through AmazonScraper, for options the legacy scraper lacks.
+    Returns the products and the pages that loaded successfully.
+    """
+    from scraper.sites.amazon import AmazonScraper
+
+    scraper = AmazonScraper(prefetch=args.prefetch)
+    scraper.profiler = profiler
+    scraper.lifecycle = make_lifecycle(scraper, args)
+    products = scraper.extract_products(args.pages, search_term, fingerprints=make_fingerprints(args))
+
+    # Match the rows and columns of scrape_amazon_products, which drops untitled listings
+    # and does not tag the site, so tuning flags do not change the CSV
+    products = [{key: value for key, value in product.items() if key != "site"}
+                for product in products if product["title"] != "N/A"]
+    return products, crawled_pages(scraper.page_log, search_term)
+
+
+def save_products(df, filename, args, search_term, pages=None):
+    """
+    Run the optional post-processing stages and save products to CSV.
+    pages are the pages crawled for the term; by default those the products came from.
+    """
+    # Optionally fetch product images
+    if args.download_images:
+        from scraper.images import download_product_images
+        df, _ = download_product_images(df, store_dir=args.image_dir or None,
+                                        thumbnails=args.thumbnails)
+
+    # Dedupe, delta and archive keys need the site, which the single-term scraper does not tag;
+    # tagging a copy keeps the CSV columns unchanged
+    keyed = df if "site" in df.columns else df.assign(site="Amazon")
+
+    # Optionally group near-duplicate listings across runs
+    if args.dedupe:
+        from scraper.dedupe import ListingMatcher, assign_clusters
+        from config import DEDUPE_SETTINGS
+        matcher = ListingMatcher.load()
+        keyed = assign_clusters(keyed, matcher)
+        df = df.assign(cluster_id=keyed["cluster_id"])
+        matcher.save(DEDUPE_SETTINGS["index_path"])
+
+    # Save to CSV
+    df.to_csv(filename, index=False, encoding='utf-8-sig')
+    print(f"\nData saved to {filename}")
+
+    # Publish inserted, updated and disappeared products to the delta feed
+    if args.delta_feed:
+        from scraper.delta import DeltaFeed
+        DeltaFeed().publish(keyed.to_dict("records"), scope=search_term, crawled_pages=pages)
+
+    # Append the run to the columnar archive
+    if args.archive:
+        from scraper.archive import append_snapshot
+        append_snapshot(keyed, search_term)
+
+
+def scrape_terms(args):
+    """Scrape several search terms in one browser and save one CSV per term"""
+    from scraper.sites.amazon import AmazonScraper
+
+    print("Amazon Multi-Term Product Scraper - Starting...")
+    print(f"Search terms: {', '.join(args.term)}")
+    print(f"Number of pages per term: {args.pages}")
+    print(f"Concurrent tabs: {args.tabs}")
+
+    scheduler = None
+    if args.min_yield is not None:
+        from scraper.scheduler import YieldScheduler
+        scheduler = YieldScheduler(args.pages, min_yield=args.min_yield,
+                                   max_pages_per_term=args.max_pages_per_term,
+                                   log_path=args.yield_log or None)
+
+    fingerprints = make_fingerprints(args)
+
+    scraper = AmazonScraper(prefetch=args.prefetch)
+    scraper.profiler = make_profiler(args)
+    scraper.lifecycle = make_lifecycle(scraper, args)
+
+    products = scraper.extract_terms(args.term, args.pages, max_tabs=args.tabs, scheduler=scheduler,
+                                     fingerprints=fingerprints)
+
+    if not products:
+        print("\n❌ No products were successfully scraped.")
+        return
+
+    df = pd.DataFrame(products)
+    for term, term_df in df.groupby("search_term", sort=False):
+        clean_term = "_".join(term.split())
+        filename = f"output/amazon_{clean_term}_{args.pages}_pages.csv"
+        save_products(term_df.copy(), filename, args, term, pages=crawled_pages(scraper.page_log, term))
+
+
 def main():
     # Setup command line argument parser
     parser = argparse.ArgumentParser(description='Amazon Product Scraper')
@@ -398,12 +537,61 @@ def main():
                         help='Number of pages to scrape (default: 1)')
     parser.add_argument('-o', '--output', type=str, default='',
                         help='Output file name (default: based on search term)')
+    parser.add_argument('--download-images', action='store_true',
+                        help='Download product images into a content-addressed store')
+    parser.add_argument('--thumbnails', action='store_true',
+                        help='Also create resized thumbnails (requires Pillow)')
+    parser.add_argument('--image-dir', type=str, default='',
+                        help='Image store directory (default: output/images)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Write a per-page WebDriver command trace and CPU profile')
+    parser.add_argument('--profile-dir', type=str, default='output/profile',
+                        help='Directory for profile output (default: output/profile)')
+    parser.add_argument('--dedupe', action='store_true',
+                        help='Add a cluster_id column grouping near-duplicate listings across runs')
+    parser.add_argument('--delta-feed', action='store_true',
+                        help='Append changed products to the delta feed in output/delta')
+    parser.add_argument('--archive', action='store_true',
+                        help='Also append results to the columnar archive (requires pyarrow)')
+    parser.add_argument('--prefetch', action='store_true',
+                        help='Load the next results page in a background tab while the current one is '
+                             'extracted (in -t mode this uses at least 2 tabs, and page 2 waits for --skip-unchanged)')
+    parser.add_argument('-t', '--term', action='append', default=[],
+                        help='Search term to scrape in multi-term mode (repeatable)')
+    parser.add_argument('--tabs', type=int, default=1,
+                        help='Concurrent browser tabs in multi-term mode (default: 1)')
+    parser.add_argument('--min-yield', type=float, default=None,
+                        help='Stop a term early when the share of new products passing the filters '
+                             'falls below this value, moving saved pages to other terms')
+    parser.add_argument('--max-pages-per-term', type=int, default=None,
+                        help='Page cap per term when borrowing saved pages (default: 2x --pages)')
+    parser.add_argument('--yield-log', type=str, default='',
+                        help='Append scheduler decisions to this JSONL file')
+    parser.add_argument('--recycle-pages', type=int, default=None,
+                        help='Restart the browser after this many pages (works with or without -t)')
+    parser.add_argument('--max-browser-mb', type=float, default=None,
+                        help='Restart the browser once its process tree uses more memory than this; '
+                             'requires psutil, without it the limit is ignored with a warning')
+    parser.add_argument('--memory-log', type=str, default='',
+                        help='Append browser memory samples and recycle events to this JSONL file')
+    parser.add_argument('--skip-unchanged', action='store_true',
+                        help='Only crawl page 1 of terms whose first page is unchanged since the last run')
+    parser.add_argument('--force-refresh', action='store_true',
+                        help='Crawl all pages even if the first page is unchanged')
+    parser.add_argument('--fingerprint-max-age', type=float, default=None,
+                        help='Force a full crawl when the last one is older than this many hours (default: 72)')
+    parser.add_argument('--fingerprint-store', type=str, default='',
+                        help='Fingerprint file (default: output/fingerprints.json)')
 
     args = parser.parse_args()
 
     # Create output directory if it doesn't exist
     os.makedirs('output', exist_ok=True)
 
+    if args.term:
+        scrape_terms(args)
+        return
+
     search_term = "+".join(args.search_term)
     search_url = f"https://www.amazon.in/s?k={search_term}"
 
@@ -425,7 +613,13 @@ def main():
     max_attempts = 3
     for attempt in range(1, max_attempts + 1):
         print(f"\nAttempt {attempt} of {max_attempts}")
-        products = scrape_amazon_products(search_url, args.pages)
+        profiler = make_profiler(args, f"attempt{attempt}")
+        # The legacy scraper below has no prefetch, fingerprint or recycling support
+        if args.prefetch or args.skip_unchanged or args.recycle_pages or args.max_browser_mb:
+            products, pages = scrape_with_scraper(" ".join(args.search_term), args, profiler=profiler)
+        else:
+            products = scrape_amazon_products(search_url, args.pages, profiler=profiler)
+            pages = None
 
         if products and len(products) > 0:
             # Convert to DataFrame for better display
@@ -442,9 +636,7 @@ def main():
             else:
                 print(df[display_cols])
 
-            # Save to CSV
-            df.to_csv(filename, index=False, encoding='utf-8-sig')
-            print(f"\nData saved to {filename}")
+            save_products(df, filename, args, " ".join(args.search_term), pages=pages)
             break
         else:
             print(f"Attempt {attempt} failed to scrape any products.")
@@ -0,0 +1,113 @@
+"""
+Columnar snapshot archive of scraper runs.
+
+Every run is appended as an uncompressed Arrow IPC (Feather v2) file so it can
+be memory-mapped and read without copying. A manifest.jsonl file indexes the
+snapshots by site, term and date.
+"""
+
+import os
+import json
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+from config import ARCHIVE_SETTINGS
+
+
+ARCHIVE_COLUMNS = ["site", "search_term", "title", "price", "rating", "reviews", "link", "image_url", "page",
+                   "scraped_at"]
+
+
+def _manifest_path(archive_dir):
+    """Return the manifest path of an archive"""
+    return os.path.join(archive_dir, "manifest.jsonl")
+
+
+def append_snapshot(df, search_term, site="Amazon", archive_dir=None, scraped_at=None):
+    """Append a run's products to the archive and return the manifest entry"""
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    archive_dir = archive_dir or ARCHIVE_SETTINGS["archive_dir"]
+    scraped_at = scraped_at or datetime.now()
+
+    df = df.copy()
+    df["search_term"] = search_term
+    df["scraped_at"] = scraped_at.isoformat(timespec="seconds")
+    for col in ARCHIVE_COLUMNS:
+        if col not in df.columns:
+            df[col] = "N/A"
+
+    # A fixed schema keeps every snapshot scannable as one dataset
+    df = df[ARCHIVE_COLUMNS].copy()
+    string_columns = [col for col in ARCHIVE_COLUMNS if col != "page"]
+    df[string_columns] = df[string_columns].astype(str)
+    df["page"] = pd.to_numeric(df["page"], errors="coerce").fillna(0).astype("int64")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    # Keep the term filesystem-safe and never overwrite a snapshot taken in the same instant
+    clean_term = "".join(c if c.isalnum() or c in "-_" else "_" for c in search_term)
+    suffix = f"{scraped_at.strftime('%H%M%S_%f')}_{uuid.uuid4().hex[:8]}"
+    relative_path = os.path.join(site.lower(), scraped_at.strftime("%Y-%m-%d"), f"{clean_term}_{suffix}.arrow")
+    path = os.path.join(archive_dir, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Uncompressed so readers can memory-map the file without decoding it
+    feather.write_feather(table, path, compression="uncompressed")
+
+    entry = {
+        "path": relative_path,
+        "site": site,
+        "search_term": search_term,
+        "date": scraped_at.strftime("%Y-%m-%d"),
+        "scraped_at": scraped_at.isoformat(timespec="seconds"),
+        "rows": table.num_rows,
+    }
+    with open(_manifest_path(archive_dir), "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+    print(f"Archived {table.num_rows} rows to {path}")
+    return entry
+
+
+def read_manifest(archive_dir=None):
+    """Return all manifest entries of an archive"""
+    archive_dir = archive_dir or ARCHIVE_SETTINGS["archive_dir"]
+    path = _manifest_path(archive_dir)
+    if not os.path.exists(path):
+        return []
+
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def select_snapshots(archive_dir=None, terms=None, sites=None, start_date=None, end_date=None):
+    """Return the file paths of snapshots matching the given terms, sites and date range"""
+    archive_dir = archive_dir or ARCHIVE_SETTINGS["archive_dir"]
+    paths = []
+    for entry in read_manifest(archive_dir):
+        if terms and entry["search_term"] not in terms:
+            continue
+        if sites and entry["site"] not in sites:
+            continue
+        if start_date and entry["date"] < str(start_date):
+            continue
+        if end_date and entry["date"] > str(end_date):
+            continue
+        paths.append(os.path.join(archive_dir, entry["path"]))
+    return paths
+
+
+def read_snapshot(path, columns=None, offset=0, length=None):
+    """Memory-map one snapshot and return the requested columns and rows as an Arrow table"""
+    import pyarrow as pa
+
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    # Column selection and slicing are zero-copy views over the mapped file
+    if columns:
+        table = table.select(columns)
+    return table.slice(offset, length)
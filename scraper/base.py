@@ -5,6 +5,7 @@ Base abstract class for all e-commerce scrapers.
 import os
 import time
 import random
+from collections import deque
 from abc import ABC, abstractmethod
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -17,13 +18,29 @@ from selenium.webdriver.support import expected_conditions as EC
 class BaseScraper(ABC):
     """Base abstract class for all e-commerce scrapers"""
 
-    def __init__(self, chromedriver_path=None):
+    def __init__(self, chromedriver_path=None, delay_range=(3, 5)):
         """Initialize the base scraper with common settings"""
         if not chromedriver_path:
             chromedriver_path = os.path.join(os.getcwd(), 'chromedriver-win64', 'chromedriver.exe')
 
         self.chromedriver_path = chromedriver_path
         self.driver = None
+        self.delay_range = delay_range
+        self._last_navigation = 0.0
+        self.home_url = None
+        # Load upcoming pages in the background while the current one is extracted
+        self.prefetch = False
+        self.last_run_stats = {}
+        self.user_agent = None
+        self.headless = False
+        # Reloads of a page that came back without results (CAPTCHA, error page);
+        # off by default because a real last page is empty too
+        self.page_retries = 0
+        self.page_log = []
+        # Optional DriverLifecycle that recycles the browser between pages
+        self.lifecycle = None
+        # Optional DriverProfiler that traces WebDriver commands per page
+        self.profiler = None
         self.user_agents = [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36",
@@ -31,8 +48,10 @@ class BaseScraper(ABC):
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.5 Safari/605.1.15"
         ]
 
-    def setup_driver(self):
+    def setup_driver(self, user_agent=None):
         """Setup and configure the Selenium WebDriver"""
+        self.user_agent = user_agent or random.choice(self.user_agents)
+
         chrome_options = Options()
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
@@ -40,10 +59,18 @@ class BaseScraper(ABC):
         chrome_options.add_argument("--ignore-certificate-errors")
         chrome_options.add_argument("--ignore-ssl-errors")
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")  # Hide automation
-        chrome_options.add_argument(f"user-agent={random.choice(self.user_agents)}")
+        # Keep background tabs loading and rendering at full speed
+        chrome_options.add_argument("--disable-background-timer-throttling")
+        chrome_options.add_argument("--disable-renderer-backgrounding")
+        chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+        chrome_options.add_argument(f"user-agent={self.user_agent}")
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
 
         self.driver = webdriver.Chrome(service=Service(self.chromedriver_path), options=chrome_options)
         self.driver.set_script_timeout(30)
+        if self.profiler:
+            self.profiler.attach(self.driver)
 
         return self.driver
 
@@ -62,6 +89,303 @@ class BaseScraper(ABC):
         # Let the page settle after scrolling
         time.sleep(2)
 
+    def mark_navigation(self):
+        """Record that a page request was just sent"""
+        self._last_navigation = time.monotonic()
+
+    def polite_wait(self):
+        """Sleep until a random politeness delay has passed since the last page request"""
+        delay = random.uniform(*self.delay_range)
+        remaining = self._last_navigation + delay - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def open_tab(self, url):
+        """Start loading a URL in a new tab without waiting for it, returning the tab handle"""
+        current_handle = self.driver.current_window_handle
+        self.driver.switch_to.new_window('tab')
+        handle = self.driver.current_window_handle
+        # Assigning the location returns immediately, unlike driver.get()
+        self.driver.execute_script("window.location.assign(arguments[0]);", url)
+        self.mark_navigation()
+        self.driver.switch_to.window(current_handle)
+        return handle
+
+    def switch_to_tab(self, handle, close_current=False):
+        """Make the given tab current, optionally closing the one we are leaving"""
+        if close_current:
+            self.driver.close()
+        self.driver.switch_to.window(handle)
+
+    def load_in_tab(self, handle, url):
+        """Start loading a URL in an existing tab without waiting for it"""
+        current_handle = self.driver.current_window_handle
+        self.driver.switch_to.window(handle)
+        self.driver.execute_script("window.location.assign(arguments[0]);", url)
+        self.mark_navigation()
+        self.driver.switch_to.window(current_handle)
+
+    def close_tab(self, handle):
+        """Close a tab and return to the current one"""
+        current_handle = self.driver.current_window_handle
+        self.driver.switch_to.window(handle)
+        self.driver.close()
+        self.driver.switch_to.window(current_handle)
+
+    def retry_page(self, driver, url, page_number):
+        """Reload a page that returned no results, returning (products or None, retries used)"""
+        for attempt in range(1, self.page_retries + 1):
+            print(f"No results on page {page_number}, retrying ({attempt}/{self.page_retries})...")
+            self.polite_wait()
+            driver.get(url)
+            self.mark_navigation()
+            self.wait_for_results(driver)
+            self.scroll_page()
+            page_products = self.extract_page(driver, page_number)
+            if page_products is not None:
+                return page_products, attempt
+        return None, self.page_retries
+
+    def log_page(self, search_term, page_number, started, page_products, retries=0):
+        """Record how long a page took from request to extracted products"""
+        self.page_log.append({
+            "search_term": search_term,
+            "page": page_number,
+            "seconds": round(time.perf_counter() - started, 3),
+            "products": len(page_products) if page_products is not None else None,
+            "retries": retries,
+        })
+
+    def browser_memory_bytes(self):
+        """Return the RSS of the chromedriver process tree, or None if it cannot be measured"""
+        try:
+            import psutil
+        except ImportError:
+            return None
+
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+        except Exception:
+            return None
+
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    def extract_terms(self, search_terms, num_pages=1, max_tabs=1, tab_reuse_limit=5, scheduler=None,
+                      fingerprints=None):
+        """
+        Extract products for several search terms in one browser.
+
+        Up to max_tabs (term, page) loads are kept in flight in separate tabs
+        while the oldest one is extracted. A tab is closed and replaced after
+        tab_reuse_limit page loads to cap renderer memory. When a scheduler is
+        given it decides after each page whether the term gets another one.
+        When a fingerprint store is given, terms whose first page is unchanged
+        since the last run are limited to fewer pages. With prefetch on, the
+        next page of a term starts loading before the current one is extracted.
+        """
+        if self.prefetch:
+            # A second tab is what lets the next page load during extraction
+            max_tabs = max(max_tabs, 2)
+
+        all_products = []
+        pending = deque((term, 1, self.generate_search_url(term)) for term in search_terms)
+        parked = deque()
+        page_limits = {}
+        in_flight = deque()
+        idle_tabs = []
+        tab_loads = {}
+        pages_done = 0
+        peak_memory = 0
+        start = time.perf_counter()
+
+        try:
+            driver = self.setup_driver()
+
+            if self.home_url:
+                # Visit the homepage first (helps avoid detection)
+                driver.get(self.home_url)
+                self.mark_navigation()
+                time.sleep(random.uniform(2, 3))
+
+            # The first tab is never closed so the browser stays alive while tabs are recycled
+            anchor_handle = driver.current_window_handle
+
+            # Parked terms keep the loop alive while the pool still has pages for them
+            while pending or in_flight or (parked and scheduler and scheduler.spare_pages > 0):
+                # Recycle the browser once it is due and no page loads are in flight
+                recycle_reason = self.lifecycle.recycle_due() if self.lifecycle else None
+                draining = bool(recycle_reason and in_flight)
+                if recycle_reason and not in_flight:
+                    driver = self.lifecycle.recycle(recycle_reason)
+                    anchor_handle = driver.current_window_handle
+                    idle_tabs.clear()
+                    tab_loads.clear()
+
+                # Hand pages saved by unproductive terms to terms waiting for budget
+                while parked and scheduler and scheduler.spare_pages > 0:
+                    term, page, url = parked.popleft()
+                    if scheduler.grant(term):
+                        pending.append((term, page, url))
+
+                # Keep up to max_tabs page loads in flight
+                while pending and len(in_flight) < max_tabs and not draining:
+                    term, page, url = pending.popleft()
+                    in_flight.append(self._start_load(term, page, url, idle_tabs, tab_loads, tab_reuse_limit))
+
+                if not in_flight:
+                    # Every parked term was already at its page cap
+                    continue
+
+                handle, term, page, url, started = in_flight.popleft()
+                if self.profiler:
+                    self.profiler.start_page(f"{term} page {page}")
+                print(f"\nScraping {self.site_name} '{term}' page {page} of {num_pages}")
+                self.switch_to_tab(handle)
+                prefetched = None
+
+                try:
+                    self.wait_for_results(driver)
+                    self.scroll_page()
+
+                    # Start loading the predictable next page before extracting this one; it is
+                    # cancelled below if the term stops. Page 2 waits for the fingerprint decision.
+                    next_url = self.build_page_url(url, page + 1) if self.prefetch else None
+                    limit = page_limits.get(term)
+                    if (next_url and not draining and len(in_flight) < max_tabs
+                            and (scheduler or page < num_pages)
+                            and not (fingerprints and page == 1)
+                            and (limit is None or page < limit)):
+                        prefetched = self._start_load(term, page + 1, next_url, idle_tabs, tab_loads,
+                                                      tab_reuse_limit)
+                        in_flight.append(prefetched)
+
+                    page_products = self.extract_page(driver, page)
+                    retries = 0
+                    if page_products is None:
+                        page_products, retries = self.retry_page(driver, url, page)
+                    self.log_page(term, page, started, page_products, retries)
+
+                    if page_products is None:
+                        if scheduler:
+                            scheduler.finish(term)
+                    else:
+                        for product in page_products:
+                            product["search_term"] = term
+                        all_products.extend(page_products)
+
+                        if scheduler:
+                            decision = scheduler.record_page(term, page, page_products)
+                        else:
+                            decision = "continue" if page < num_pages else "stop"
+
+                        if fingerprints and page == 1:
+                            page_limits[term] = fingerprints.page_limit(term, page_products)
+                        if fingerprints and page == num_pages:
+                            fingerprints.mark_full_crawl(term)
+                        if page_limits.get(term) is not None and page >= page_limits[term]:
+                            decision = "stop"
+                            if scheduler:
+                                scheduler.finish(term)
+
+                        if decision == "continue" and prefetched:
+                            prefetched = None
+                        elif decision == "continue":
+                            pending.append((term, page + 1, self.next_page_url(driver, url, page)))
+                        elif decision == "park":
+                            parked.append((term, page + 1, prefetched[3] if prefetched
+                                           else self.next_page_url(driver, url, page)))
+                except Exception as e:
+                    print(f"Error scraping '{term}' page {page}: {str(e)}")
+                    if scheduler:
+                        scheduler.finish(term)
+
+                if prefetched in in_flight:
+                    # The term stopped or was parked, so its prefetched page is not needed
+                    in_flight.remove(prefetched)
+                    idle_tabs.append(prefetched[0])
+
+                if self.profiler:
+                    self.profiler.end_page()
+                pages_done += 1
+                idle_tabs.append(handle)
+                self.switch_to_tab(anchor_handle)
+
+                memory = self.lifecycle.record_page() if self.lifecycle else self.browser_memory_bytes()
+                if memory:
+                    peak_memory = max(peak_memory, memory)
+
+            print(f"Successfully extracted a total of {len(all_products)} products from {self.site_name}")
+            return all_products
+
+        except Exception as e:
+            print(f"An error occurred during {self.site_name} scraping: {str(e)}")
+            return all_products
+
+        finally:
+            if self.profiler:
+                self.profiler.close()
+            self.close_driver()
+            if fingerprints:
+                fingerprints.save()
+            self.last_run_stats = self._run_stats(pages_done, time.perf_counter() - start, peak_memory, max_tabs)
+            self.print_run_stats()
+            if self.lifecycle:
+                self.lifecycle.print_summary()
+
+    def _start_load(self, term, page, url, idle_tabs, tab_loads, tab_reuse_limit):
+        """Start loading a page in an idle or new tab, returning its in-flight entry"""
+        self.polite_wait()
+        print(f"Loading '{term}' page {page} in background: {url}")
+
+        handle = idle_tabs.pop() if idle_tabs else None
+        if handle and tab_loads[handle] >= tab_reuse_limit:
+            # Recycle tabs that have served enough pages
+            self.close_tab(handle)
+            del tab_loads[handle]
+            handle = None
+
+        if handle:
+            self.load_in_tab(handle, url)
+        else:
+            handle = self.open_tab(url)
+            tab_loads[handle] = 0
+
+        tab_loads[handle] += 1
+        return (handle, term, page, url, time.perf_counter())
+
+    def _run_stats(self, pages, elapsed, peak_memory, max_tabs):
+        """Compute throughput figures for a finished run"""
+        pages_per_minute = pages / elapsed * 60 if elapsed > 0 else 0.0
+        stats = {
+            "tabs": max_tabs,
+            "pages": pages,
+            "elapsed_seconds": round(elapsed, 1),
+            "pages_per_minute": round(pages_per_minute, 2),
+            "peak_memory_mb": round(peak_memory / 2**20, 1) if peak_memory else None,
+            "pages_per_minute_per_gb": None,
+        }
+        if peak_memory:
+            stats["pages_per_minute_per_gb"] = round(pages_per_minute / (peak_memory / 2**30), 2)
+        return stats
+
+    def print_run_stats(self):
+        """Print throughput figures of the last run"""
+        stats = self.last_run_stats
+        print(f"\n{stats['pages']} pages in {stats['elapsed_seconds']}s with {stats['tabs']} tab(s): "
+              f"{stats['pages_per_minute']} pages/min")
+        if stats["peak_memory_mb"]:
+            print(f"Peak browser memory: {stats['peak_memory_mb']} MB, "
+                  f"{stats['pages_per_minute_per_gb']} pages/min per GB")
+        else:
+            print("Browser memory not measured (install psutil to enable)")
+
     def close_driver(self):
         """Close the selenium driver"""
         if self.driver:
@@ -77,6 +401,25 @@ class BaseScraper(ABC):
         pass
 
     @abstractmethod
-    def extract_products(self, num_pages=1, search_term=""):
+    def wait_for_results(self, driver):
+        """Wait for the results page in the current tab to load"""
+        pass
+
+    @abstractmethod
+    def extract_page(self, driver, page_number):
+        """Extract products from the current results page, or None if there are no results"""
+        pass
+
+    def build_page_url(self, url, page_number):
+        """Return the URL of a given results page without loading it, or None if it cannot be predicted"""
+        return None
+
+    @abstractmethod
+    def next_page_url(self, driver, current_url, current_page):
+        """Return the URL of the next results page"""
+        pass
+
+    @abstractmethod
+    def extract_products(self, num_pages=1, search_term="", fingerprints=None):
         """Extract products from search results"""
         pass
\ No newline at end of file
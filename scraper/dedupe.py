@@ -0,0 +1,194 @@
+"""
+Near-duplicate listing detection with MinHash signatures and an LSH index.
+"""
+
+import os
+import re
+import zlib
+import pickle
+import random
+
+from config import DEDUPE_SETTINGS
+from scraper.utils import extract_asin
+
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def normalize_title(title):
+    """Lowercase a title and strip punctuation and repeated whitespace"""
+    if not isinstance(title, str):
+        return ""
+    title = re.sub(r"[^a-z0-9]+", " ", title.lower())
+    return " ".join(title.split())
+
+
+def normalize_price(price):
+    """Parse a price like '₹1,299.00' into a float, or None"""
+    if isinstance(price, (int, float)):
+        return float(price)
+    if not isinstance(price, str):
+        return None
+    match = re.search(r"\d[\d,]*(?:\.\d+)?", price)
+    return float(match.group(0).replace(",", "")) if match else None
+
+
+def shingles(text, size=4):
+    """Return the hashed character shingles of a normalized title"""
+    if len(text) <= size:
+        return {zlib.crc32(text.encode("utf-8"))} if text else set()
+    return {zlib.crc32(text[i:i + size].encode("utf-8")) for i in range(len(text) - size + 1)}
+
+
+class ListingMatcher:
+    """
+    Incremental near-duplicate matcher over product titles and prices.
+
+    Each listing gets a MinHash signature that is split into LSH bands, so a
+    new listing is only compared against listings sharing at least one band.
+    Candidates whose estimated title similarity reaches the threshold and whose
+    prices are within price_tolerance of each other are merged into a cluster.
+    """
+
+    def __init__(self, num_perm=None, bands=None, threshold=None, price_tolerance=None, seed=1):
+        settings = DEDUPE_SETTINGS
+        self.num_perm = num_perm or settings["num_perm"]
+        self.bands = bands or settings["bands"]
+        self.threshold = threshold if threshold is not None else settings["threshold"]
+        self.price_tolerance = price_tolerance if price_tolerance is not None else settings["price_tolerance"]
+
+        if self.num_perm % self.bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.rows = self.num_perm // self.bands
+
+        rng = random.Random(seed)
+        self.permutations = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+                             for _ in range(self.num_perm)]
+
+        self.buckets = [{} for _ in range(self.bands)]
+        self.signatures = {}
+        self.prices = {}
+        self.parents = {}
+        self.order = {}
+
+    def signature(self, title):
+        """Compute the MinHash signature of a title"""
+        hashes = shingles(normalize_title(title))
+        if not hashes:
+            return None
+        return tuple(
+            min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes)
+            for a, b in self.permutations
+        )
+
+    def _band_keys(self, signature):
+        """Split a signature into one hashable key per band"""
+        return [signature[i * self.rows:(i + 1) * self.rows] for i in range(self.bands)]
+
+    def _prices_match(self, price, other_price):
+        """Check whether two normalized prices are close enough to be the same product"""
+        if price is None or other_price is None:
+            return True
+        return abs(price - other_price) <= self.price_tolerance * max(price, other_price)
+
+    def _find(self, key):
+        """Return the cluster root of a listing"""
+        root = key
+        while self.parents[root] != root:
+            root = self.parents[root]
+        # Path compression
+        while self.parents[key] != root:
+            self.parents[key], key = root, self.parents[key]
+        return root
+
+    def _union(self, key, other_key):
+        """Merge two clusters, keeping the older root so existing IDs stay stable"""
+        root, other_root = self._find(key), self._find(other_key)
+        if root == other_root:
+            return
+        if self.order[root] < self.order[other_root]:
+            self.parents[other_root] = root
+        else:
+            self.parents[root] = other_root
+
+    def add(self, key, title, price=None):
+        """Add a listing and return its cluster ID"""
+        if key in self.parents:
+            return self._find(key)
+
+        self.parents[key] = key
+        self.order[key] = len(self.order)
+        signature = self.signature(title)
+        if signature is None:
+            return key
+
+        price = normalize_price(price)
+        band_keys = self._band_keys(signature)
+
+        candidates = set()
+        for band, band_key in zip(self.buckets, band_keys):
+            candidates.update(band.get(band_key, ()))
+
+        for candidate in candidates:
+            other = self.signatures[candidate]
+            similarity = sum(1 for x, y in zip(signature, other) if x == y) / self.num_perm
+            if similarity >= self.threshold and self._prices_match(price, self.prices[candidate]):
+                self._union(key, candidate)
+
+        for band, band_key in zip(self.buckets, band_keys):
+            band.setdefault(band_key, []).append(key)
+        self.signatures[key] = signature
+        self.prices[key] = price
+
+        return self._find(key)
+
+    def cluster_id(self, key):
+        """Return the cluster ID of a listing that was already added"""
+        return self._find(key)
+
+    def save(self, path):
+        """Persist the index so later runs can keep matching incrementally"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(self.__dict__, f)
+
+    @classmethod
+    def load(cls, path=None):
+        """Load a saved index, or create an empty one if it does not exist"""
+        path = path or DEDUPE_SETTINGS["index_path"]
+        matcher = cls()
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                matcher.__dict__.update(pickle.load(f))
+        return matcher
+
+
+def listing_key(product, index=None):
+    """Return the site + ASIN key of a product, falling back to its link"""
+    site = product["site"]
+    asin = extract_asin(product.get("link"))
+    if asin:
+        return f"{site}:{asin}"
+    link = product.get("link")
+    if isinstance(link, str) and link != "N/A":
+        return f"{site}:{link}"
+    return f"{site}:{product.get('title', '')}:{index}"
+
+
+def assign_clusters(df, matcher=None):
+    """Add a cluster_id column to a products DataFrame, updating the matcher incrementally"""
+    matcher = matcher or ListingMatcher()
+    cluster_ids = []
+    for index, product in enumerate(df.to_dict("records")):
+        key = listing_key(product, index)
+        matcher.add(key, product.get("title"), product.get("price"))
+        cluster_ids.append(key)
+
+    # Resolve after all additions so earlier rows pick up later merges
+    df["cluster_id"] = [matcher.cluster_id(key) for key in cluster_ids]
+    clusters = df["cluster_id"].nunique()
+    print(f"Matched {len(df)} listings into {clusters} clusters")
+    return df
@@ -0,0 +1,236 @@
+"""
+Change-data-capture feed of scraped products.
+
+Each run is compared with the products last seen across all search terms and
+only inserted, updated and disappeared products are appended to the feed as
+JSONL segments, keyed by site and ASIN. Every change has a monotonic sequence number, so consumers
+can resume from the last one they processed.
+"""
+
+import os
+import json
+import time
+
+from config import DELTA_SETTINGS
+from scraper.utils import extract_asin
+
+
+# Fields compared between runs; link and page change with ranking and tracking
+# parameters, so they are carried in the record but do not trigger updates
+TRACKED_FIELDS = ["title", "price", "rating", "reviews", "image_url"]
+RECORD_FIELDS = TRACKED_FIELDS + ["link", "page"]
+
+
+def _write_json_atomic(path, data):
+    """Write JSON through a temporary file so readers never see a partial file"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _page_number(value):
+    """Return a page number as an int, or None if it is missing"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _plain_value(value):
+    """Convert numpy scalars and NaN from DataFrame rows into JSON-friendly values"""
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return "N/A"
+    return value
+
+
+class DeltaFeed:
+    """
+    Producer side of the delta feed, keyed by site and ASIN.
+
+    A product is inserted the first time any search term lists it and deleted
+    only once no search term lists it any more, so consumers can apply the
+    changes by site and ASIN alone.
+    """
+
+    def __init__(self, feed_dir=None):
+        self.feed_dir = feed_dir or DELTA_SETTINGS["feed_dir"]
+        self.segment_dir = os.path.join(self.feed_dir, "segments")
+        self.state_path = os.path.join(self.feed_dir, "state.json")
+        os.makedirs(self.segment_dir, exist_ok=True)
+
+        # records: latest record per site:ASIN; scopes: site:ASIN -> page listed on, per search term
+        self.state = {"next_seq": 1, "records": {}, "scopes": {}}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                self.state = json.load(f)
+
+        if "records" not in self.state:
+            # Older state files kept a full snapshot per search term
+            records = {}
+            for snapshot in self.state["scopes"].values():
+                records.update(snapshot)
+            self.state["records"] = records
+            self.state["scopes"] = {scope: {key: record.get("page") for key, record in snapshot.items()}
+                                    for scope, snapshot in self.state["scopes"].items()}
+
+        # A segment written just before a crash may be ahead of the saved state
+        last_seq = last_sequence(self.feed_dir)
+        if last_seq >= self.state["next_seq"]:
+            self.state["next_seq"] = last_seq + 1
+
+    def _snapshot(self, products):
+        """Index products by site:ASIN, keeping the first occurrence"""
+        snapshot = {}
+        for product in products:
+            asin = extract_asin(product.get("link"))
+            if not asin:
+                continue
+            key = f"{product.get('site', 'N/A')}:{asin}"
+            if key not in snapshot:
+                record = {field: _plain_value(product.get(field, "N/A")) for field in RECORD_FIELDS}
+                record["site"] = product.get("site", "N/A")
+                record["asin"] = asin
+                snapshot[key] = record
+        return snapshot
+
+    def diff(self, products, scope, crawled_pages=None):
+        """
+        Return the changes this run of a scope causes, the records it saw and
+        the scope's new listing (site:ASIN -> page).
+
+        Only products last listed on one of crawled_pages (by default the pages
+        the products came from) can drop out of the scope; products on pages
+        this run did not reach stay listed. A product that drops out is only
+        deleted when no other scope still lists it.
+        """
+        records = self.state["records"]
+        previous = self.state["scopes"].get(scope, {})
+        current = self._snapshot(products)
+        if crawled_pages is None:
+            crawled_pages = {product.get("page") for product in products}
+        crawled = {_page_number(page) for page in crawled_pages} - {None}
+        changes = []
+        listing = {key: record["page"] for key, record in current.items()}
+
+        for key, record in current.items():
+            old = records.get(key)
+            if old is None:
+                changes.append({"op": "insert", "record": record})
+                continue
+            changed = {field: {"old": old.get(field), "new": record.get(field)}
+                       for field in TRACKED_FIELDS if old.get(field) != record.get(field)}
+            if changed:
+                changes.append({"op": "update", "record": record, "changed": changed})
+
+        for key, page in previous.items():
+            if key in current:
+                continue
+            if _page_number(page) not in crawled:
+                listing[key] = page
+                continue
+            listed_elsewhere = any(key in keys for other, keys in self.state["scopes"].items() if other != scope)
+            if not listed_elsewhere and key in records:
+                changes.append({"op": "delete", "record": records[key]})
+
+        return changes, current, listing
+
+    def publish(self, products, scope, crawled_pages=None):
+        """Append the changes of a run as a new segment and return its path, or None"""
+        changes, current, listing = self.diff(products, scope, crawled_pages)
+        counts = {op: sum(1 for change in changes if change["op"] == op) for op in ("insert", "update", "delete")}
+        print(f"Delta feed for '{scope}': {counts['insert']} inserted, {counts['update']} updated, "
+              f"{counts['delete']} disappeared")
+
+        path = None
+        if changes:
+            first_seq = self.state["next_seq"]
+            path = os.path.join(self.segment_dir, f"{first_seq:012d}.jsonl")
+            emitted_at = time.time()
+
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for seq, change in enumerate(changes, start=first_seq):
+                    record = change["record"]
+                    entry = {"seq": seq, "op": change["op"], "site": record["site"], "asin": record["asin"],
+                             "scope": scope, "emitted_at": emitted_at, "record": record}
+                    if "changed" in change:
+                        entry["changed"] = change["changed"]
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, path)
+
+            self.state["next_seq"] = first_seq + len(changes)
+
+        self.state["records"].update(current)
+        for change in changes:
+            if change["op"] == "delete":
+                del self.state["records"][f"{change['record']['site']}:{change['record']['asin']}"]
+        self.state["scopes"][scope] = listing
+        _write_json_atomic(self.state_path, self.state)
+        return path
+
+
+def _segment_paths(feed_dir):
+    """Return (first sequence number, path) of every segment in order"""
+    segment_dir = os.path.join(feed_dir, "segments")
+    if not os.path.isdir(segment_dir):
+        return []
+    segments = []
+    for name in os.listdir(segment_dir):
+        if name.endswith(".jsonl"):
+            segments.append((int(name.split(".")[0]), os.path.join(segment_dir, name)))
+    return sorted(segments)
+
+
+def last_sequence(feed_dir):
+    """Return the highest sequence number in the feed, or 0 if it is empty"""
+    segments = _segment_paths(feed_dir)
+    if not segments:
+        return 0
+    last_line = None
+    with open(segments[-1][1], encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                last_line = line
+    return json.loads(last_line)["seq"] if last_line else segments[-1][0] - 1
+
+
+def read_changes(feed_dir=None, offset=0):
+    """Yield every change with a sequence number greater than offset"""
+    feed_dir = feed_dir or DELTA_SETTINGS["feed_dir"]
+    segments = _segment_paths(feed_dir)
+    for index, (first_seq, path) in enumerate(segments):
+        # Skip whole segments that end before the offset
+        if index + 1 < len(segments) and segments[index + 1][0] <= offset + 1:
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                change = json.loads(line)
+                if change["seq"] > offset:
+                    yield change
+
+
+class DeltaConsumer:
+    """Consumer side of the delta feed that remembers its offset between runs"""
+
+    def __init__(self, name, feed_dir=None):
+        self.feed_dir = feed_dir or DELTA_SETTINGS["feed_dir"]
+        self.offset_path = os.path.join(self.feed_dir, "offsets", f"{name}.json")
+        self.offset = 0
+        if os.path.exists(self.offset_path):
+            with open(self.offset_path, encoding="utf-8") as f:
+                self.offset = json.load(f)["offset"]
+
+    def poll(self):
+        """Yield changes after the saved offset"""
+        return read_changes(self.feed_dir, self.offset)
+
+    def commit(self, seq):
+        """Save the sequence number of the last processed change"""
+        os.makedirs(os.path.dirname(self.offset_path), exist_ok=True)
+        self.offset = seq
+        _write_json_atomic(self.offset_path, {"offset": seq, "committed_at": time.time()})
@@ -0,0 +1,91 @@
+"""
+Change detection for search terms based on a fingerprint of their first page.
+"""
+
+import os
+import json
+import time
+import hashlib
+
+from config import RECRAWL_SETTINGS
+from scraper.utils import extract_asin
+
+
+def page_fingerprint(products):
+    """Fingerprint a results page from its ordered ASINs and their prices"""
+    digest = hashlib.sha256()
+    for product in products:
+        key = extract_asin(product.get("link")) or product.get("title", "")
+        price_hash = hashlib.md5(str(product.get("price", "")).encode("utf-8")).hexdigest()[:8]
+        digest.update(f"{key}:{price_hash}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class FingerprintStore:
+    """
+    Persisted first-page fingerprints, one per search term.
+
+    When page 1 of a term matches the previous run, deeper pages are limited
+    to unchanged_pages. A full crawl is forced when force_refresh is set or
+    the last full crawl of the term is older than max_age_hours. A crawl
+    only counts as full once mark_full_crawl is called for the term.
+    """
+
+    def __init__(self, path=None, max_age_hours=None, unchanged_pages=None, force_refresh=False):
+        settings = RECRAWL_SETTINGS
+        self.path = path or settings["store_path"]
+        self.max_age_hours = max_age_hours if max_age_hours is not None else settings["max_age_hours"]
+        self.unchanged_pages = unchanged_pages if unchanged_pages is not None else settings["unchanged_pages"]
+        self.force_refresh = force_refresh
+
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def page_limit(self, term, first_page_products):
+        """Record page 1 of a term and return how many pages to crawl, or None for no limit"""
+        now = time.time()
+        fingerprint = page_fingerprint(first_page_products)
+        previous = self.entries.get(term)
+
+        if self.force_refresh:
+            reason = "forced refresh"
+        elif not previous:
+            reason = "no previous fingerprint"
+        elif not previous.get("full_crawl_at"):
+            reason = "no completed full crawl"
+        elif now - previous["full_crawl_at"] > self.max_age_hours * 3600:
+            reason = "last full crawl too old"
+        elif previous["fingerprint"] != fingerprint:
+            reason = "first page changed"
+        else:
+            reason = None
+
+        entry = {"fingerprint": fingerprint, "checked_at": now,
+                 "full_crawl_at": previous.get("full_crawl_at") if previous else None}
+
+        if reason:
+            print(f"Fingerprint: '{term}' needs a full crawl ({reason})")
+            limit = None
+        else:
+            print(f"Fingerprint: '{term}' unchanged since last run, limiting to {self.unchanged_pages} page(s)")
+            limit = self.unchanged_pages
+
+        self.entries[term] = entry
+        return limit
+
+    def mark_full_crawl(self, term):
+        """Record that a term was crawled to its requested page count"""
+        if term in self.entries:
+            self.entries[term]["full_crawl_at"] = time.time()
+
+    def save(self):
+        """Persist the fingerprints"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
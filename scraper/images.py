@@ -0,0 +1,264 @@
+"""
+Product image downloader built on the scraper output.
+
+Images are fetched concurrently over a pooled HTTP client, deduplicated by
+URL and by content hash, and stored content-addressed on disk so re-runs
+skip anything that was already downloaded.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+import urllib3
+
+from config import BASE_HEADERS, IMAGE_SETTINGS
+
+
+CONTENT_TYPE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+}
+
+
+def make_thumbnail(source_path, thumb_path, size):
+    """Write a resized copy of an image (runs inside a worker process)"""
+    from PIL import Image
+
+    os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+    with Image.open(source_path) as img:
+        img.thumbnail(size)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        img.save(thumb_path, "JPEG", quality=85)
+    return thumb_path
+
+
+class ImageStore:
+    """Content-addressed image store with a url -> hash index"""
+
+    def __init__(self, root):
+        self.root = root
+        self.index_path = os.path.join(root, "index.json")
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+
+    def path_for(self, digest, extension=".jpg"):
+        """Return the storage path for a content hash"""
+        return os.path.join(self.root, "objects", digest[:2], digest + extension)
+
+    def thumb_path_for(self, digest):
+        """Return the thumbnail path for a content hash"""
+        return os.path.join(self.root, "thumbs", digest[:2], digest + ".jpg")
+
+    def lookup(self, url):
+        """Return the stored entry for a URL if its file is still on disk"""
+        entry = self.index.get(url)
+        if entry and os.path.exists(entry["path"]):
+            return entry
+        return None
+
+    def put(self, url, content, content_type):
+        """Store image bytes, returning (entry, newly_written)"""
+        digest = hashlib.sha256(content).hexdigest()
+        extension = CONTENT_TYPE_EXTENSIONS.get(content_type, ".jpg")
+        path = self.path_for(digest, extension)
+
+        with self._lock:
+            written = False
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+                written = True
+
+            entry = {"hash": digest, "path": path, "bytes": len(content)}
+            self.index[url] = entry
+
+        return entry, written
+
+    def save_index(self):
+        """Persist the url -> hash index"""
+        with self._lock:
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self.index_path)
+
+
+class ImageDownloader:
+    """Download product images with bounded concurrency and deduplication"""
+
+    def __init__(self, store_dir=None, concurrency=None, timeout=None, thumbnail_size=None,
+                 thumbnail_workers=None, http=None):
+        settings = IMAGE_SETTINGS
+        self.store = ImageStore(store_dir or settings["store_dir"])
+        self.concurrency = concurrency or settings["concurrency"]
+        self.timeout = timeout or settings["timeout"]
+        self.thumbnail_size = thumbnail_size
+        self.thumbnail_workers = thumbnail_workers or settings["thumbnail_workers"]
+
+        # One pooled client shared by every worker thread
+        self.http = http or urllib3.PoolManager(
+            num_pools=4,
+            maxsize=self.concurrency,
+            headers=BASE_HEADERS,
+            retries=urllib3.Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+
+    def _fetch(self, url):
+        """Fetch a single image, returning (content, content_type)"""
+        response = self.http.request("GET", url, timeout=self.timeout, preload_content=True)
+        if response.status != 200:
+            raise ValueError(f"HTTP {response.status}")
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+        return response.data, content_type
+
+    def _download(self, url):
+        """Download and store one image, returning a result record"""
+        try:
+            content, content_type = self._fetch(url)
+        except Exception as e:
+            return {"url": url, "status": "failed", "error": str(e), "bytes": 0}
+
+        entry, written = self.store.put(url, content, content_type)
+        status = "downloaded" if written else "duplicate_content"
+        return {"url": url, "status": status, "hash": entry["hash"], "path": entry["path"],
+                "bytes": entry["bytes"]}
+
+    def download(self, urls):
+        """Download all valid, unique URLs and return (results, stats)"""
+        start = time.perf_counter()
+        stats = {
+            "requested": 0,
+            "duplicate_urls": 0,
+            "already_stored": 0,
+            "downloaded": 0,
+            "duplicate_content": 0,
+            "failed": 0,
+            "bytes_downloaded": 0,
+            # Bytes not fetched thanks to URL dedup and the on-disk index
+            "network_bytes_saved": 0,
+            # Bytes fetched but not written because identical content was stored
+            "disk_bytes_saved": 0,
+        }
+        results = {}
+        pending = []
+        seen = set()
+        duplicate_counts = {}
+
+        for url in urls:
+            if not isinstance(url, str) or not url.startswith(("http://", "https://")):
+                continue
+            stats["requested"] += 1
+            if url in seen:
+                stats["duplicate_urls"] += 1
+                duplicate_counts[url] = duplicate_counts.get(url, 0) + 1
+                continue
+            seen.add(url)
+
+            entry = self.store.lookup(url)
+            if entry:
+                stats["already_stored"] += 1
+                stats["network_bytes_saved"] += entry["bytes"]
+                results[url] = {"url": url, "status": "already_stored", **entry}
+            else:
+                pending.append(url)
+
+        print(f"Downloading {len(pending)} images ({stats['already_stored']} already stored, "
+              f"{stats['duplicate_urls']} duplicate URLs)")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self._download, url) for url in pending]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result["url"]] = result
+                stats[result["status"]] += 1
+                stats["bytes_downloaded"] += result["bytes"]
+                if result["status"] == "duplicate_content":
+                    stats["disk_bytes_saved"] += result["bytes"]
+
+        # Repeated URLs were fetched (or found on disk) once
+        for url, count in duplicate_counts.items():
+            stats["network_bytes_saved"] += count * results.get(url, {}).get("bytes", 0)
+
+        self.store.save_index()
+
+        if self.thumbnail_size:
+            self.make_thumbnails(results.values())
+
+        elapsed = time.perf_counter() - start
+        fetched = stats["downloaded"] + stats["duplicate_content"]
+        stats["elapsed_seconds"] = round(elapsed, 3)
+        stats["images_per_second"] = round(fetched / elapsed, 2) if elapsed > 0 else 0.0
+        stats["megabytes_per_second"] = round(stats["bytes_downloaded"] / elapsed / 1e6, 3) if elapsed > 0 else 0.0
+
+        return results, stats
+
+    def make_thumbnails(self, results):
+        """Create missing thumbnails for stored images in a process pool"""
+        jobs = {}
+        for result in results:
+            if "hash" not in result:
+                continue
+            thumb_path = self.store.thumb_path_for(result["hash"])
+            result["thumbnail_path"] = thumb_path
+            if not os.path.exists(thumb_path):
+                jobs[thumb_path] = result["path"]
+
+        if not jobs:
+            return
+
+        print(f"Creating {len(jobs)} thumbnails...")
+        with ProcessPoolExecutor(max_workers=self.thumbnail_workers) as executor:
+            futures = {
+                executor.submit(make_thumbnail, source, thumb, self.thumbnail_size): thumb
+                for thumb, source in jobs.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Could not create thumbnail {futures[future]}: {str(e)}")
+
+
+def print_image_stats(stats):
+    """Print a short throughput and dedup report"""
+    print("\nImage download summary:")
+    print(f"  Requested URLs:      {stats['requested']}")
+    print(f"  Duplicate URLs:      {stats['duplicate_urls']}")
+    print(f"  Already stored:      {stats['already_stored']}")
+    print(f"  Downloaded:          {stats['downloaded']}")
+    print(f"  Duplicate content:   {stats['duplicate_content']}")
+    print(f"  Failed:              {stats['failed']}")
+    print(f"  Bytes downloaded:    {stats['bytes_downloaded']}")
+    print(f"  Network bytes saved: {stats['network_bytes_saved']} (duplicate URLs and already stored)")
+    print(f"  Disk bytes saved:    {stats['disk_bytes_saved']} (duplicate content)")
+    print(f"  Throughput:          {stats['images_per_second']} images/s, "
+          f"{stats['megabytes_per_second']} MB/s in {stats['elapsed_seconds']}s")
+
+
+def download_product_images(df, store_dir=None, thumbnails=False, **kwargs):
+    """Download images for a products DataFrame and add local path columns"""
+    thumbnail_size = IMAGE_SETTINGS["thumbnail_size"] if thumbnails else None
+    downloader = ImageDownloader(store_dir=store_dir, thumbnail_size=thumbnail_size, **kwargs)
+    results, stats = downloader.download(df["image_url"].tolist())
+
+    df["image_path"] = df["image_url"].map(lambda url: results.get(url, {}).get("path", "N/A"))
+    if thumbnails:
+        df["thumbnail_path"] = df["image_url"].map(lambda url: results.get(url, {}).get("thumbnail_path", "N/A"))
+
+    print_image_stats(stats)
+    return df, stats
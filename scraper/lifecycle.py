@@ -0,0 +1,125 @@
+"""
+Driver lifecycle management for long-running scrapers.
+"""
+
+import json
+import time
+
+
+class DriverLifecycle:
+    """
+    Recycle a scraper's browser after a number of pages or above a memory budget.
+
+    The RSS of the chromedriver process tree is sampled after every page.
+    Recycling quits the browser and starts a fresh one with the same user
+    agent and cookies. Memory samples and recycle events are kept for
+    capacity planning and can be appended to a JSONL log.
+    """
+
+    def __init__(self, scraper, max_pages=None, max_memory_mb=None, log_path=None):
+        self.scraper = scraper
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.log_path = log_path
+
+        if max_memory_mb:
+            try:
+                import psutil  # noqa: F401
+            except ImportError:
+                print("Warning: psutil is not installed, so browser memory cannot be measured "
+                      "and the memory limit will never trigger a recycle")
+
+        self.pages_total = 0
+        self.pages_since_recycle = 0
+        self.last_memory_mb = None
+        self.samples = []
+        self.events = []
+
+    def record_page(self):
+        """Count a finished page and sample browser memory, returning the RSS in bytes"""
+        self.pages_total += 1
+        self.pages_since_recycle += 1
+
+        memory = self.scraper.browser_memory_bytes()
+        self.last_memory_mb = round(memory / 2**20, 1) if memory else None
+        self._log({
+            "type": "sample",
+            "pages_total": self.pages_total,
+            "pages_since_recycle": self.pages_since_recycle,
+            "rss_mb": self.last_memory_mb,
+        }, self.samples)
+        return memory
+
+    def recycle_due(self):
+        """Return the reason the driver should be recycled now, or None"""
+        if self.max_pages and self.pages_since_recycle >= self.max_pages:
+            return "page_limit"
+        if self.max_memory_mb and self.last_memory_mb and self.last_memory_mb >= self.max_memory_mb:
+            return "memory_limit"
+        return None
+
+    def recycle(self, reason):
+        """Restart the browser, carrying over the user agent and cookies"""
+        scraper = self.scraper
+        start = time.perf_counter()
+
+        cookies = []
+        try:
+            cookies = scraper.driver.get_cookies()
+        except Exception as e:
+            print(f"Could not read cookies before recycling: {str(e)}")
+
+        memory_before = self.last_memory_mb
+        print(f"Recycling browser after {self.pages_since_recycle} pages ({reason}, RSS: {memory_before or 'not measured'} MB)")
+
+        scraper.close_driver()
+        driver = scraper.setup_driver(user_agent=scraper.user_agent)
+
+        if scraper.home_url:
+            # Cookies can only be set for the domain that is currently loaded
+            driver.get(scraper.home_url)
+            scraper.mark_navigation()
+            for cookie in cookies:
+                cookie.pop("sameSite", None)
+                try:
+                    driver.add_cookie(cookie)
+                except Exception:
+                    continue
+
+        self.pages_since_recycle = 0
+        self.last_memory_mb = None
+        self._log({
+            "type": "recycle",
+            "reason": reason,
+            "pages_total": self.pages_total,
+            "rss_mb_before": memory_before,
+            "cookies_restored": len(cookies),
+            "duration_seconds": round(time.perf_counter() - start, 2),
+        }, self.events)
+        return driver
+
+    def maybe_recycle(self):
+        """Recycle the driver if a limit was reached, returning True if it was"""
+        reason = self.recycle_due()
+        if not reason:
+            return False
+        self.recycle(reason)
+        return True
+
+    def print_summary(self):
+        """Print recycle events and peak memory of the run"""
+        measured = [sample["rss_mb"] for sample in self.samples if sample["rss_mb"]]
+        peak = max(measured) if measured else None
+        print(f"\nDriver lifecycle: {self.pages_total} pages, {len(self.events)} recycle(s), "
+              f"peak browser RSS: {f'{peak} MB' if peak else 'not measured'}")
+        for event in self.events:
+            print(f"  Recycled after page {event['pages_total']} ({event['reason']}, "
+                  f"RSS before: {event['rss_mb_before']} MB, took {event['duration_seconds']}s)")
+
+    def _log(self, record, target):
+        """Keep a sample or event and append it to the log file"""
+        record["timestamp"] = time.time()
+        target.append(record)
+        if self.log_path:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
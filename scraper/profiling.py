@@ -0,0 +1,156 @@
+"""
+Per-page WebDriver command tracing and CPU profiling.
+
+Every WebDriver command goes through driver.execute(), so wrapping that one
+method timestamps navigation, element lookups and attribute reads alike.
+Nothing is wrapped unless a profiler is attached.
+"""
+
+import os
+import io
+import json
+import time
+import pstats
+import cProfile
+from collections import defaultdict
+
+
+class DriverProfiler:
+    """
+    Trace WebDriver commands and profile extraction page by page.
+
+    For each page a Chrome trace-event file (open it in chrome://tracing or
+    Perfetto), a cProfile dump and a text summary of the slowest selectors
+    and call sites are written to output_dir.
+    """
+
+    def __init__(self, output_dir="output/profile", top=15):
+        self.output_dir = output_dir
+        self.top = top
+        os.makedirs(output_dir, exist_ok=True)
+
+        self._origin = time.perf_counter()
+        self.page_label = None
+        self.page_started = None
+        self.events = []
+        self.cpu = None
+
+    def attach(self, driver):
+        """Wrap driver.execute so every command is timed"""
+        execute = driver.execute
+
+        def timed_execute(driver_command, params=None):
+            started = time.perf_counter()
+            success = False
+            try:
+                result = execute(driver_command, params)
+                success = True
+                return result
+            finally:
+                self._record(driver_command, params, started, time.perf_counter(), success)
+
+        driver.execute = timed_execute
+        return driver
+
+    def _record(self, command, params, started, finished, success):
+        """Keep one command as a trace event if a page is being profiled"""
+        if self.page_label is None:
+            return
+
+        params = params or {}
+        if "value" in params and "using" in params:
+            selector = f"{params['using']}={params['value']}"
+        elif "script" in params:
+            selector = " ".join(params["script"].split())[:80]
+        elif "url" in params:
+            selector = params["url"]
+        elif "name" in params:
+            selector = params["name"]
+        else:
+            selector = ""
+
+        self.events.append({
+            "name": command,
+            "cat": "webdriver",
+            "ph": "X",
+            "ts": (started - self._origin) * 1e6,
+            "dur": (finished - started) * 1e6,
+            "pid": os.getpid(),
+            "tid": 1,
+            "args": {"selector": selector, "success": success},
+        })
+
+    def start_page(self, label):
+        """Start tracing and profiling a page"""
+        if self.page_label is not None:
+            self.end_page()
+        self.page_label = label
+        self.page_started = time.perf_counter()
+        self.events = []
+        self.cpu = cProfile.Profile()
+        self.cpu.enable()
+
+    def end_page(self):
+        """Stop profiling the current page and write its trace and summary"""
+        if self.page_label is None:
+            return
+
+        self.cpu.disable()
+        finished = time.perf_counter()
+        label = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.page_label)
+        base_path = os.path.join(self.output_dir, label)
+
+        page_event = {
+            "name": self.page_label,
+            "cat": "page",
+            "ph": "X",
+            "ts": (self.page_started - self._origin) * 1e6,
+            "dur": (finished - self.page_started) * 1e6,
+            "pid": os.getpid(),
+            "tid": 0,
+            "args": {"commands": len(self.events)},
+        }
+        with open(base_path + ".trace.json", "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": [page_event] + self.events, "displayTimeUnit": "ms"}, f)
+
+        self.cpu.dump_stats(base_path + ".prof")
+        summary = self._summary(finished - self.page_started)
+        with open(base_path + ".summary.txt", "w", encoding="utf-8") as f:
+            f.write(summary)
+
+        print(f"Profile for {self.page_label}: {len(self.events)} WebDriver commands in "
+              f"{finished - self.page_started:.1f}s, written to {base_path}.*")
+
+        self.page_label = None
+        self.cpu = None
+
+    def _summary(self, page_seconds):
+        """Build the text summary of the slowest selectors and call sites"""
+        totals = defaultdict(lambda: {"count": 0, "seconds": 0.0, "failures": 0})
+        for event in self.events:
+            key = (event["name"], event["args"]["selector"])
+            totals[key]["count"] += 1
+            totals[key]["seconds"] += event["dur"] / 1e6
+            totals[key]["failures"] += 0 if event["args"]["success"] else 1
+
+        webdriver_seconds = sum(event["dur"] for event in self.events) / 1e6
+        lines = [
+            f"Page: {self.page_label}",
+            f"Wall time: {page_seconds:.2f}s, WebDriver commands: {len(self.events)} ({webdriver_seconds:.2f}s)",
+            "",
+            "Slowest commands and selectors (total time):",
+            f"{'seconds':>9} {'calls':>6} {'failed':>6}  command  selector",
+        ]
+        ranked = sorted(totals.items(), key=lambda item: item[1]["seconds"], reverse=True)
+        for (command, selector), total in ranked[:self.top]:
+            lines.append(f"{total['seconds']:>9.3f} {total['count']:>6} {total['failures']:>6}  {command}  {selector}")
+
+        stream = io.StringIO()
+        stats = pstats.Stats(self.cpu, stream=stream)
+        stats.sort_stats("cumulative").print_stats(self.top)
+        lines += ["", "Python call sites (cumulative time):", stream.getvalue()]
+        return "\n".join(lines)
+
+    def close(self):
+        """Finish any page that is still being profiled"""
+        self.end_page()
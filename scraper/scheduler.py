@@ -0,0 +1,133 @@
+"""
+Yield-aware page scheduler for multi-term scraping.
+"""
+
+import json
+import time
+
+from scraper.utils import extract_asin, passes_filters
+
+
+class YieldScheduler:
+    """
+    Decide page by page whether a search term is still worth crawling.
+
+    Every term starts with pages_per_term pages. A page's yield is the share
+    of its products that are new unique ASINs passing the filters. A term is
+    stopped once its yield stays below min_yield for `patience` pages, and
+    the pages it did not use go to a shared pool that productive terms can
+    draw from, up to max_pages_per_term.
+    """
+
+    def __init__(self, pages_per_term, min_yield=0.1, patience=1, max_pages_per_term=None,
+                 filters=None, log_path=None):
+        self.pages_per_term = pages_per_term
+        self.min_yield = min_yield
+        self.patience = patience
+        self.max_pages_per_term = max_pages_per_term or pages_per_term * 2
+        self.filters = filters
+        self.log_path = log_path
+
+        self.spare_pages = 0
+        self.seen_asins = set()
+        self.terms = {}
+        self.decisions = []
+
+    def _term_state(self, term):
+        """Return the bookkeeping for a term, creating it on first use"""
+        if term not in self.terms:
+            self.terms[term] = {"allotment": self.pages_per_term, "pages": 0, "low_pages": 0, "done": False}
+        return self.terms[term]
+
+    def page_yield(self, products):
+        """Return (new unique ASINs, new ASINs passing filters, yield) for a page"""
+        new_unique = 0
+        new_passing = 0
+        for product in products:
+            asin = extract_asin(product.get("link"))
+            if not asin or asin in self.seen_asins:
+                continue
+            self.seen_asins.add(asin)
+            new_unique += 1
+            if passes_filters(product, self.filters):
+                new_passing += 1
+
+        page_yield = new_passing / len(products) if products else 0.0
+        return new_unique, new_passing, page_yield
+
+    def record_page(self, term, page, products):
+        """
+        Record an extracted page and decide what to do next with the term.
+
+        Returns "continue", "park" (productive but out of budget) or "stop".
+        """
+        state = self._term_state(term)
+        state["pages"] = max(state["pages"], page)
+        new_unique, new_passing, page_yield = self.page_yield(products)
+
+        if page_yield < self.min_yield:
+            state["low_pages"] += 1
+        else:
+            state["low_pages"] = 0
+
+        if state["low_pages"] >= self.patience:
+            decision, reason = "stop", "low_yield"
+        elif state["pages"] >= self.max_pages_per_term:
+            decision, reason = "stop", "max_pages"
+        elif state["pages"] < state["allotment"]:
+            decision, reason = "continue", "within_budget"
+        elif self.spare_pages > 0:
+            self.spare_pages -= 1
+            state["allotment"] += 1
+            decision, reason = "continue", "borrowed_page"
+        else:
+            decision, reason = "park", "out_of_budget"
+
+        if decision == "stop":
+            self.finish(term)
+
+        self._log({
+            "term": term,
+            "page": page,
+            "products": len(products),
+            "new_unique": new_unique,
+            "new_passing": new_passing,
+            "yield": round(page_yield, 3),
+            "decision": decision,
+            "reason": reason,
+            "spare_pages": self.spare_pages,
+        })
+        return decision
+
+    def finish(self, term):
+        """Mark a term as finished and release its unused pages into the pool"""
+        state = self._term_state(term)
+        if state["done"]:
+            return
+        state["done"] = True
+        unused = max(0, state["allotment"] - state["pages"])
+        self.spare_pages += unused
+
+    def grant(self, term):
+        """Give a parked term one more page from the pool if any is left"""
+        state = self._term_state(term)
+        if self.spare_pages <= 0 or state["pages"] >= self.max_pages_per_term:
+            return False
+        self.spare_pages -= 1
+        state["allotment"] += 1
+        self._log({"term": term, "page": state["pages"] + 1, "decision": "continue",
+                   "reason": "granted_page", "spare_pages": self.spare_pages})
+        return True
+
+    def _log(self, decision):
+        """Print a scheduling decision and append it to the decision log"""
+        decision["timestamp"] = time.time()
+        self.decisions.append(decision)
+
+        details = f"yield={decision['yield']} " if "yield" in decision else ""
+        print(f"Scheduler: '{decision['term']}' page {decision['page']} {details}"
+              f"-> {decision['decision']} ({decision['reason']}, spare pages: {decision['spare_pages']})")
+
+        if self.log_path:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(decision) + "\n")
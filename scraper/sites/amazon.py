@@ -2,6 +2,7 @@
 Amazon specific scraper implementation.
 """
 
+import re
 import time
 import random
 from selenium.webdriver.common.by import By
@@ -15,17 +16,312 @@ from scraper.base import BaseScraper
 class AmazonScraper(BaseScraper):
     """Amazon specific scraper implementation"""
 
-    def __init__(self, chromedriver_path=None):
+    def __init__(self, chromedriver_path=None, prefetch=False, base_url="https://www.amazon.in"):
         super().__init__(chromedriver_path)
         self.site_name = "Amazon"
+        self.base_url = base_url.rstrip("/")
+        self.home_url = self.base_url + "/"
+        # Load page N+1 in a background tab while page N is being extracted
+        self.prefetch = prefetch
 
     def generate_search_url(self, search_term):
         """Generate Amazon search URL"""
         formatted_term = "+".join(search_term.split())
-        return f"https://www.amazon.in/s?k={formatted_term}"
+        return f"{self.base_url}/s?k={formatted_term}"
 
-    def extract_products(self, num_pages=1, search_term=""):
-        """Extract products from Amazon search results"""
+    def build_page_url(self, url, page_number):
+        """Build the URL of a given results page from a search URL"""
+        if re.search(r"[?&]page=\d+", url):
+            return re.sub(r"(?<=[?&])page=\d+", f"page={page_number}", url)
+        separator = "&" if "?" in url else "?"
+        return f"{url}{separator}page={page_number}"
+
+    def wait_for_results(self, driver):
+        """Wait for the results page to load"""
+        try:
+            WebDriverWait(driver, 30).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "div.s-result-item"))
+            )
+        except TimeoutException:
+            print("Timeout waiting for results page to load.")
+
+    def find_product_containers(self, driver):
+        """Find product containers on the current page, filtering out non-product items"""
+        selectors = [
+            "div.s-result-item[data-component-type='s-search-result']",
+            "div.sg-col-4-of-24.sg-col-4-of-12",
+            "div.sg-col-inner",
+            "div.s-result-item"
+        ]
+
+        product_containers = []
+        for selector in selectors:
+            product_containers = driver.find_elements(By.CSS_SELECTOR, selector)
+            if len(product_containers) > 0:
+                print(f"Found {len(product_containers)} products using selector: {selector}")
+                break
+
+        if len(product_containers) == 0:
+            print("Could not find any product containers with known selectors")
+            return []
+
+        # Filter out non-product items
+        filtered_containers = []
+        for container in product_containers:
+            try:
+                # Check if this is actually a product
+                if (container.text and
+                        ("₹" in container.text or
+                         "Prime" in container.text or
+                         any(keyword in container.text.lower() for keyword in
+                             ["keyboard", "delivery", "stars", "reviews"]))):
+                    filtered_containers.append(container)
+            except:
+                continue
+
+        print(f"After filtering, found {len(filtered_containers)} valid product containers")
+        return filtered_containers
+
+    def extract_page(self, driver, page_number):
+        """Extract all products from the current results page, or None if no results were found"""
+        product_containers = self.find_product_containers(driver)
+        if not product_containers:
+            return None
+
+        page_products = []
+        for container in product_containers:
+            try:
+                product = self.extract_product(container, page_number)
+                if product:
+                    page_products.append(product)
+            except Exception:
+                continue
+
+        print(f"Successfully extracted {len(page_products)} products from {self.site_name} page {page_number}")
+        return page_products
+
+    def extract_product(self, container, page_number):
+        """Extract a single product from a result container, or None if it is not a product"""
+        # Extract product details
+        product = {"site": self.site_name}
+
+        # Get container text for fallback extraction
+        container_text = container.text
+
+        # Try various selectors for title
+        title_selectors = [
+            "h2 a span",
+            ".a-size-medium.a-color-base.a-text-normal",
+            ".a-size-base-plus.a-color-base.a-text-normal",
+            ".a-link-normal .a-text-normal",
+            "h2"
+        ]
+
+        # Product title
+        for selector in title_selectors:
+            try:
+                title_element = container.find_element(By.CSS_SELECTOR, selector)
+                title_text = title_element.text.strip()
+                if title_text and len(title_text) > 5:
+                    product["title"] = title_text
+                    break
+            except:
+                continue
+
+        if "title" not in product:
+            # Fallback: extract title from container text
+            lines = container_text.split('\n')
+            for line in lines:
+                if len(line.strip()) > 10 and "sponsored" not in line.lower():
+                    product["title"] = line.strip()
+                    break
+            if "title" not in product:
+                product["title"] = "N/A"
+
+        # Product price
+        price_selectors = [
+            "span.a-price span.a-offscreen",
+            "span.a-price",
+            ".a-price .a-offscreen",
+            ".a-price-whole"
+        ]
+
+        for selector in price_selectors:
+            try:
+                price_element = container.find_element(By.CSS_SELECTOR, selector)
+                price_text = price_element.text.strip()
+                if not price_text and selector.endswith("a-offscreen"):
+                    price_text = price_element.get_attribute("textContent").strip()
+
+                if price_text:
+                    product["price"] = price_text
+                    break
+            except:
+                continue
+
+        if "price" not in product:
+            # Fallback: look for ₹ symbol in text
+            lines = container_text.split('\n')
+            for line in lines:
+                if '₹' in line:
+                    product["price"] = line.strip()
+                    break
+            if "price" not in product:
+                product["price"] = "N/A"
+
+        # Product rating
+        rating_selectors = [
+            "span.a-icon-alt",
+            "i.a-icon-star-small",
+            ".a-star-medium-4"
+        ]
+
+        for selector in rating_selectors:
+            try:
+                rating_element = container.find_element(By.CSS_SELECTOR, selector)
+                rating_text = rating_element.get_attribute("textContent").strip()
+                if not rating_text:
+                    rating_text = rating_element.text.strip()
+
+                if rating_text:
+                    product["rating"] = rating_text
+                    break
+            except:
+                continue
+
+        if "rating" not in product:
+            # Try to find ratings in text
+            for line in container_text.split('\n'):
+                if "out of 5 stars" in line or "stars" in line.lower():
+                    product["rating"] = line.strip()
+                    break
+            if "rating" not in product:
+                product["rating"] = "N/A"
+
+        # Number of reviews
+        review_selectors = [
+            "span.a-size-base.s-underline-text",
+            ".a-link-normal .a-size-base",
+            "[aria-label*='reviews']"
+        ]
+
+        for selector in review_selectors:
+            try:
+                review_element = container.find_element(By.CSS_SELECTOR, selector)
+                review_text = review_element.text.strip()
+                if review_text and any(c.isdigit() for c in review_text):
+                    product["reviews"] = review_text
+                    break
+            except:
+                continue
+
+        if "reviews" not in product:
+            product["reviews"] = "N/A"
+
+        # Product link
+        link_selectors = [
+            "h2 a",
+            ".a-link-normal",
+            "a[href*='/dp/']"
+        ]
+
+        for selector in link_selectors:
+            try:
+                link_elements = container.find_elements(By.CSS_SELECTOR, selector)
+                for link_element in link_elements:
+                    href = link_element.get_attribute("href")
+                    if href and ("/dp/" in href or "/gp/product/" in href):
+                        product["link"] = href
+                        break
+                if "link" in product:
+                    break
+            except:
+                continue
+
+        if "link" not in product:
+            product["link"] = "N/A"
+
+        # Product image
+        img_selectors = [
+            "img.s-image",
+            ".s-image",
+            "img[src*='images/I']"
+        ]
+
+        for selector in img_selectors:
+            try:
+                img_elements = container.find_elements(By.CSS_SELECTOR, selector)
+                for img_element in img_elements:
+                    src = img_element.get_attribute("src")
+                    if src and not src.endswith(".gif"):
+                        product["image_url"] = src
+                        break
+                if "image_url" in product:
+                    break
+            except:
+                continue
+
+        if "image_url" not in product:
+            product["image_url"] = "N/A"
+
+        # Try to extract brand/manufacturer
+        for line in container_text.split('\n'):
+            # Look for brand text that's typically near the top before price
+            if line.strip() and len(line.strip()) < 30 and line.strip() != product.get("title", ""):
+                if "price" not in line.lower() and "₹" not in line:
+                    product["brand"] = line.strip()
+                    break
+        if "brand" not in product:
+            product["brand"] = "N/A"
+
+        # Try to extract delivery info
+        for line in container_text.split('\n'):
+            if any(keyword in line.lower() for keyword in ["delivery", "free", "arrives", "shipping"]):
+                product["delivery"] = line.strip()
+                break
+            elif "prime" in line.lower():
+                product["delivery"] = "Prime"
+                break
+        if "delivery" not in product:
+            product["delivery"] = "N/A"
+
+        # Add page number information
+        product["page"] = page_number
+
+        # Keep the product if we have at least title OR a valid link
+        if product["title"] != "N/A" or ("/dp/" in product.get("link", "")):
+            return product
+        return None
+
+    def next_page_url(self, driver, current_url, current_page):
+        """Find the URL of the next results page, falling back to building it"""
+        next_page_selectors = [
+            ".s-pagination-item.s-pagination-next",
+            "a.s-pagination-next",
+            "li.a-last a",
+            "a[aria-label='Go to next page']"
+        ]
+
+        for selector in next_page_selectors:
+            try:
+                next_button = driver.find_element(By.CSS_SELECTOR, selector)
+                if "a-disabled" not in next_button.get_attribute("class"):
+                    href = next_button.get_attribute("href")
+                    if href:
+                        return href
+            except:
+                continue
+
+        # Try to construct the next page URL manually
+        return self.build_page_url(current_url, current_page + 1)
+
+    def extract_products(self, num_pages=1, search_term="", fingerprints=None):
+        """
+        Extract products from Amazon search results.
+
+        When a fingerprint store is given and page 1 is unchanged since the
+        last run, fewer pages are crawled.
+        """
         all_products = []
         search_url = self.generate_search_url(search_term)
 
@@ -33,288 +329,98 @@ class AmazonScraper(BaseScraper):
             driver = self.setup_driver()
 
             # Navigate to Amazon homepage first (helps avoid detection)
-            driver.get("https://www.amazon.in/")
+            driver.get(self.home_url)
+            self.mark_navigation()
             time.sleep(random.uniform(2, 3))
 
             current_page = 1
             current_url = search_url
+            prefetched_handle = None
+            page_limit = None
 
             while current_page <= num_pages:
                 print(f"\nScraping {self.site_name} page {current_page} of {num_pages}")
-                print(f"Navigating to: {current_url}")
 
-                driver.get(current_url)
+                # A fresh browser loses the prefetch tab, so the page is loaded directly
+                if current_page > 1 and self.lifecycle and self.lifecycle.maybe_recycle():
+                    driver = self.driver
+                    prefetched_handle = None
+                    # The recycle just loaded the homepage
+                    self.polite_wait()
+
+                started = time.perf_counter()
+                if self.profiler:
+                    self.profiler.start_page(f"{search_term} page {current_page}")
+
+                if prefetched_handle:
+                    # The page has been loading in a background tab while the previous one was extracted;
+                    # its latency counts from the request, like a page loaded directly
+                    print(f"Switching to prefetched page: {current_url}")
+                    self.switch_to_tab(prefetched_handle, close_current=True)
+                    prefetched_handle = None
+                    started = prefetch_started
+                else:
+                    print(f"Navigating to: {current_url}")
+                    driver.get(current_url)
+                    self.mark_navigation()
 
                 # Wait for page to load
-                try:
-                    WebDriverWait(driver, 30).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.s-result-item"))
-                    )
-                except TimeoutException:
-                    print("Timeout waiting for results page to load.")
+                self.wait_for_results(driver)
 
                 # Scroll through the page
                 self.scroll_page()
 
-                # Find product containers
-                selectors = [
-                    "div.s-result-item[data-component-type='s-search-result']",
-                    "div.sg-col-4-of-24.sg-col-4-of-12",
-                    "div.sg-col-inner",
-                    "div.s-result-item"
-                ]
-
-                product_containers = []
-                for selector in selectors:
-                    product_containers = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if len(product_containers) > 0:
-                        print(f"Found {len(product_containers)} products using selector: {selector}")
-                        break
-
-                if len(product_containers) == 0:
-                    print("Could not find any product containers with known selectors")
-                    break
-
-                # Filter out non-product items
-                filtered_containers = []
-                for container in product_containers:
-                    try:
-                        # Check if this is actually a product
-                        if (container.text and
-                                ("₹" in container.text or
-                                 "Prime" in container.text or
-                                 any(keyword in container.text.lower() for keyword in
-                                     ["keyboard", "delivery", "stars", "reviews"]))):
-                            filtered_containers.append(container)
-                    except:
-                        continue
-
-                print(f"After filtering, found {len(filtered_containers)} valid product containers")
-                product_containers = filtered_containers
-
-                page_products = []
-
-                for container in product_containers:
+                # Start loading the next page before extracting this one, but not before the
+                # page-1 fingerprint has decided whether page 2 is needed at all
+                if (self.prefetch and current_page < num_pages
+                        and not (fingerprints and current_page == 1)
+                        and (page_limit is None or current_page < page_limit)):
+                    next_url = self.build_page_url(search_url, current_page + 1)
+                    self.polite_wait()
+                    print(f"Prefetching page {current_page + 1}: {next_url}")
                     try:
-                        # Extract product details
-                        product = {"site": self.site_name}
-
-                        # Get container text for fallback extraction
-                        container_text = container.text
-
-                        # Try various selectors for title
-                        title_selectors = [
-                            "h2 a span",
-                            ".a-size-medium.a-color-base.a-text-normal",
-                            ".a-size-base-plus.a-color-base.a-text-normal",
-                            ".a-link-normal .a-text-normal",
-                            "h2"
-                        ]
-
-                        # Product title
-                        for selector in title_selectors:
-                            try:
-                                title_element = container.find_element(By.CSS_SELECTOR, selector)
-                                title_text = title_element.text.strip()
-                                if title_text and len(title_text) > 5:
-                                    product["title"] = title_text
-                                    break
-                            except:
-                                continue
-
-                        if "title" not in product:
-                            # Fallback: extract title from container text
-                            lines = container_text.split('\n')
-                            for line in lines:
-                                if len(line.strip()) > 10 and "sponsored" not in line.lower():
-                                    product["title"] = line.strip()
-                                    break
-                            if "title" not in product:
-                                product["title"] = "N/A"
-
-                        # Product price
-                        price_selectors = [
-                            "span.a-price span.a-offscreen",
-                            "span.a-price",
-                            ".a-price .a-offscreen",
-                            ".a-price-whole"
-                        ]
-
-                        for selector in price_selectors:
-                            try:
-                                price_element = container.find_element(By.CSS_SELECTOR, selector)
-                                price_text = price_element.text.strip()
-                                if not price_text and selector.endswith("a-offscreen"):
-                                    price_text = price_element.get_attribute("textContent").strip()
-
-                                if price_text:
-                                    product["price"] = price_text
-                                    break
-                            except:
-                                continue
-
-                        if "price" not in product:
-                            # Fallback: look for ₹ symbol in text
-                            lines = container_text.split('\n')
-                            for line in lines:
-                                if '₹' in line:
-                                    product["price"] = line.strip()
-                                    break
-                            if "price" not in product:
-                                product["price"] = "N/A"
-
-                        # Product rating
-                        rating_selectors = [
-                            "span.a-icon-alt",
-                            "i.a-icon-star-small",
-                            ".a-star-medium-4"
-                        ]
-
-                        for selector in rating_selectors:
-                            try:
-                                rating_element = container.find_element(By.CSS_SELECTOR, selector)
-                                rating_text = rating_element.get_attribute("textContent").strip()
-                                if not rating_text:
-                                    rating_text = rating_element.text.strip()
-
-                                if rating_text:
-                                    product["rating"] = rating_text
-                                    break
-                            except:
-                                continue
-
-                        if "rating" not in product:
-                            # Try to find ratings in text
-                            for line in container_text.split('\n'):
-                                if "out of 5 stars" in line or "stars" in line.lower():
-                                    product["rating"] = line.strip()
-                                    break
-                            if "rating" not in product:
-                                product["rating"] = "N/A"
-
-                        # Number of reviews
-                        review_selectors = [
-                            "span.a-size-base.s-underline-text",
-                            ".a-link-normal .a-size-base",
-                            "[aria-label*='reviews']"
-                        ]
-
-                        for selector in review_selectors:
-                            try:
-                                review_element = container.find_element(By.CSS_SELECTOR, selector)
-                                review_text = review_element.text.strip()
-                                if review_text and any(c.isdigit() for c in review_text):
-                                    product["reviews"] = review_text
-                                    break
-                            except:
-                                continue
-
-                        if "reviews" not in product:
-                            product["reviews"] = "N/A"
-
-                        # Product link
-                        link_selectors = [
-                            "h2 a",
-                            ".a-link-normal",
-                            "a[href*='/dp/']"
-                        ]
-
-                        for selector in link_selectors:
-                            try:
-                                link_elements = container.find_elements(By.CSS_SELECTOR, selector)
-                                for link_element in link_elements:
-                                    href = link_element.get_attribute("href")
-                                    if href and ("/dp/" in href or "/gp/product/" in href):
-                                        product["link"] = href
-                                        break
-                                if "link" in product:
-                                    break
-                            except:
-                                continue
-
-                        if "link" not in product:
-                            product["link"] = "N/A"
-
-                        # Product image
-                        img_selectors = [
-                            "img.s-image",
-                            ".s-image",
-                            "img[src*='images/I']"
-                        ]
-
-                        for selector in img_selectors:
-                            try:
-                                img_elements = container.find_elements(By.CSS_SELECTOR, selector)
-                                for img_element in img_elements:
-                                    src = img_element.get_attribute("src")
-                                    if src and not src.endswith(".gif"):
-                                        product["image_url"] = src
-                                        break
-                                if "image_url" in product:
-                                    break
-                            except:
-                                continue
-
-                        if "image_url" not in product:
-                            product["image_url"] = "N/A"
-
-                        # Add page number information
-                        product["page"] = current_page
-
-                        # Add product if we have at least title OR a valid link
-                        if product["title"] != "N/A" or ("/dp/" in product.get("link", "")):
-                            page_products.append(product)
-
+                        prefetch_started = time.perf_counter()
+                        prefetched_handle = self.open_tab(next_url)
                     except Exception as e:
-                        continue
+                        print(f"Could not prefetch next page, continuing sequentially: {str(e)}")
+                        prefetched_handle = None
+
+                page_products = self.extract_page(driver, current_page)
+                retries = 0
+                if page_products is None:
+                    page_products, retries = self.retry_page(driver, current_url, current_page)
+                self.log_page(search_term, current_page, started, page_products, retries)
+                if self.profiler:
+                    self.profiler.end_page()
+                if page_products is None:
+                    break
 
-                print(f"Successfully extracted {len(page_products)} products from {self.site_name} page {current_page}")
                 all_products.extend(page_products)
+                if self.lifecycle:
+                    self.lifecycle.record_page()
+
+                if fingerprints and current_page == 1:
+                    page_limit = fingerprints.page_limit(search_term, page_products)
 
                 # Check if we've reached the requested number of pages
                 if current_page >= num_pages:
+                    if fingerprints:
+                        fingerprints.mark_full_crawl(search_term)
+                    break
+
+                if page_limit is not None and current_page >= page_limit:
                     break
 
-                # Find and click the next page button
-                next_page_found = False
+                if prefetched_handle:
+                    current_url = next_url
+                    current_page += 1
+                    continue
+
                 try:
-                    # Try multiple selectors for the next page button
-                    next_page_selectors = [
-                        ".s-pagination-item.s-pagination-next",
-                        "a.s-pagination-next",
-                        "li.a-last a",
-                        "a[aria-label='Go to next page']"
-                    ]
-
-                    for selector in next_page_selectors:
-                        try:
-                            next_button = driver.find_element(By.CSS_SELECTOR, selector)
-                            if "a-disabled" not in next_button.get_attribute("class"):
-                                current_url = next_button.get_attribute("href")
-                                next_page_found = True
-                                break
-                        except:
-                            continue
-
-                    if not next_page_found:
-                        # Try to construct the next page URL manually
-                        if "page=" in current_url:
-                            # Replace existing page parameter
-                            current_url = current_url.replace(f"page={current_page}", f"page={current_page + 1}")
-                        else:
-                            # Add page parameter
-                            if "?" in current_url:
-                                current_url += f"&page={current_page + 1}"
-                            else:
-                                current_url += f"?page={current_page + 1}"
-                        next_page_found = True
-
-                    if not next_page_found:
-                        print(f"Could not find next page button. Stopping at page {current_page}.")
-                        break
+                    current_url = self.next_page_url(driver, current_url, current_page)
 
                     # Random wait between page navigations to mimic human behavior
-                    time.sleep(random.uniform(3, 5))
+                    time.sleep(random.uniform(*self.delay_range))
                     current_page += 1
 
                 except Exception as e:
@@ -329,4 +435,10 @@ class AmazonScraper(BaseScraper):
             return all_products
 
         finally:
-            self.close_driver()
\ No newline at end of file
+            if self.profiler:
+                self.profiler.close()
+            self.close_driver()
+            if fingerprints:
+                fingerprints.save()
+            if self.lifecycle:
+                self.lifecycle.print_summary()
@@ -0,0 +1,237 @@
+"""
+Local mock storefront that serves Amazon-like search result pages.
+
+Used to load-test the scraper offline. Latency, error rates, CAPTCHA
+interstitials and slow image assets can be configured.
+"""
+
+import html
+import time
+import zlib
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, quote_plus
+
+
+TITLE_WORDS = ["Wireless", "Mechanical", "Ergonomic", "Compact", "Backlit", "USB", "Bluetooth", "Gaming",
+               "Keyboard", "Mouse", "Combo", "Silent", "Rechargeable", "Slim", "RGB", "Portable"]
+BRANDS = ["Logitech", "HP", "Dell", "Zebronics", "Portronics", "Redragon", "Cosmic Byte", "Lenovo"]
+
+# Smallest valid JPEG header padded with deterministic bytes per image
+JPEG_HEADER = bytes.fromhex("ffd8ffe000104a46494600010100000100010000")
+
+LAZY_IMAGE_SCRIPT = """
+<script>
+function loadVisibleImages() {
+  document.querySelectorAll('img.s-image[data-src]').forEach(function (img) {
+    if (img.getBoundingClientRect().top < window.innerHeight * 1.5) {
+      img.src = img.getAttribute('data-src');
+      img.removeAttribute('data-src');
+    }
+  });
+}
+window.addEventListener('scroll', loadVisibleImages);
+window.addEventListener('load', loadVisibleImages);
+</script>
+"""
+
+
+class StorefrontHandler(BaseHTTPRequestHandler):
+    """Request handler; the owning MockStorefront is available as self.server.storefront"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        storefront = self.server.storefront
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+
+        if parsed.path.startswith(("/images/", "/static/", "/captcha/")):
+            self._send_image(storefront, parsed.path)
+            return
+
+        storefront.delay(storefront.latency)
+
+        if storefront.roll(storefront.error_rate):
+            storefront.count("errors")
+            self._send(503, "<html><body><h1>Service Unavailable</h1></body></html>")
+            return
+
+        if parsed.path == "/s":
+            if storefront.roll(storefront.captcha_rate):
+                storefront.count("captchas")
+                self._send(200, storefront.captcha_page())
+                return
+            term = query.get("k", [""])[0]
+            page = int(query.get("page", ["1"])[0])
+            storefront.count("search_pages")
+            self._send(200, storefront.search_page(term, page))
+        elif parsed.path.startswith("/dp/"):
+            storefront.count("product_pages")
+            self._send(200, f"<html><body><h1>Product {html.escape(parsed.path[4:])}</h1></body></html>")
+        else:
+            storefront.count("other_pages")
+            self._send(200, "<html><body><h1>Mock Storefront</h1><form action='/s'><input name='k'></form></body></html>")
+
+    def _send_image(self, storefront, path):
+        """Serve a deterministic fake JPEG, optionally slowly"""
+        storefront.delay(storefront.asset_latency)
+        storefront.count("images")
+        name = path.rsplit("/", 1)[-1]
+        body = storefront.image_bytes(name)
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send(self, status, body):
+        """Send an HTML response"""
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class MockStorefront:
+    """Threaded local HTTP server serving paginated mock search results"""
+
+    def __init__(self, host="127.0.0.1", port=0, products_per_page=24, total_pages=20, latency=(0.0, 0.0),
+                 asset_latency=(0.0, 0.0), error_rate=0.0, captcha_rate=0.0, seed=0):
+        self.products_per_page = products_per_page
+        self.total_pages = total_pages
+        self.latency = latency
+        self.asset_latency = asset_latency
+        self.error_rate = error_rate
+        self.captcha_rate = captcha_rate
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"search_pages": 0, "product_pages": 0, "other_pages": 0, "images": 0, "errors": 0,
+                      "captchas": 0}
+
+        self.server = ThreadingHTTPServer((host, port), StorefrontHandler)
+        self.server.daemon_threads = True
+        self.server.storefront = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL of the running server"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve requests in a background thread"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down"""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def roll(self, probability):
+        """Return True with the given probability"""
+        if probability <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < probability
+
+    def delay(self, latency_range):
+        """Sleep for a random time within a (min, max) range"""
+        low, high = latency_range
+        if high > 0:
+            with self._lock:
+                seconds = self._random.uniform(low, high)
+            time.sleep(seconds)
+
+    def count(self, key):
+        """Increment a served-response counter"""
+        with self._lock:
+            self.stats[key] += 1
+
+    def image_bytes(self, name):
+        """Return fake image bytes; every fourth product shares its image with another"""
+        image_id = zlib.crc32(name.encode("utf-8")) % 1000
+        if image_id % 4 == 0:
+            image_id = 0
+        filler = random.Random(image_id).randbytes(2048)
+        return JPEG_HEADER + filler + b"\xff\xd9"
+
+    def products(self, term, page):
+        """Generate the deterministic products of a results page"""
+        rng = random.Random(zlib.crc32(f"{term}:{page}".encode("utf-8")))
+        products = []
+        for i in range(self.products_per_page):
+            asin = "B0" + "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789") for _ in range(8))
+            words = rng.sample(TITLE_WORDS, 4)
+            products.append({
+                "asin": asin,
+                "title": f"{rng.choice(BRANDS)} {' '.join(words)} for {term.title()} - Model {rng.randint(100, 999)}",
+                "price": f"₹{rng.randint(299, 9999):,}",
+                "rating": f"{rng.uniform(3.0, 5.0):.1f} out of 5 stars",
+                "reviews": f"{rng.randint(0, 25000):,}",
+                "sponsored": i % 8 == 0,
+            })
+        return products
+
+    def search_page(self, term, page):
+        """Render a search results page with working pagination"""
+        items = []
+        if page <= self.total_pages:
+            for product in self.products(term, page):
+                sponsored = "<span class='puis-label-popover'>Sponsored</span>" if product["sponsored"] else ""
+                items.append(f"""
+<div class="s-result-item" data-component-type="s-search-result" data-asin="{product['asin']}">
+  <div class="sg-col-inner">
+    {sponsored}
+    <h2><a class="a-link-normal" href="/dp/{product['asin']}/ref=sr_1"><span>{html.escape(product['title'])}</span></a></h2>
+    <a class="a-link-normal" href="/dp/{product['asin']}/ref=sr_1">
+      <img class="s-image" src="/static/grey-pixel.gif" data-src="/images/{product['asin']}.jpg" alt="">
+    </a>
+    <span class="a-price"><span class="a-offscreen">{product['price']}</span><span aria-hidden="true">{product['price']}</span></span>
+    <span class="a-icon-alt">{product['rating']}</span>
+    <span class="a-size-base s-underline-text">{product['reviews']}</span>
+    <span>FREE delivery Tomorrow</span>
+  </div>
+</div>""")
+
+        encoded_term = quote_plus(term)
+        if page < self.total_pages:
+            next_link = (f"<a class='s-pagination-item s-pagination-next' "
+                         f"href='/s?k={encoded_term}&page={page + 1}'>Next</a>")
+        else:
+            next_link = "<span class='s-pagination-item s-pagination-next s-pagination-disabled a-disabled'>Next</span>"
+
+        return f"""<!DOCTYPE html>
+<html><head><title>Amazon.in : {html.escape(term)}</title></head>
+<body>
+<div class="s-main-slot">{''.join(items)}</div>
+<div class="s-pagination-container">{next_link}</div>
+<div style="height: 2000px"></div>
+{LAZY_IMAGE_SCRIPT}
+</body></html>"""
+
+    def captcha_page(self):
+        """Render a CAPTCHA interstitial without any results"""
+        return """<!DOCTYPE html>
+<html><head><title>Amazon.in</title></head>
+<body>
+<h4>Enter the characters you see below</h4>
+<form method="get" action="/errors/validateCaptcha">
+  <img src="/captcha/image.jpg"><input id="captchacharacters" name="field-keywords">
+  <button type="submit">Continue shopping</button>
+</form>
+</body></html>"""
@@ -2,8 +2,12 @@
 Utility functions for the scraper package.
 """
 
+import re
+
 import pandas as pd
 
+from config import FILTERS
+
 
 def merge_dataframes(dataframes):
     """Merge multiple dataframes into one with consistent columns"""
@@ -18,4 +22,74 @@ def merge_dataframes(dataframes):
         if col not in combined_df.columns:
             combined_df[col] = "N/A"
 
-    return combined_df
\ No newline at end of file
+    return combined_df
+
+
+def extract_asin(link):
+    """Extract the ASIN from an Amazon product link, or None"""
+    if not isinstance(link, str):
+        return None
+    match = re.search(r"/(?:dp|gp/product)/([A-Z0-9]{10})", link)
+    return match.group(1) if match else None
+
+
+def parse_rating(rating_text):
+    """Parse a rating like '4.3 out of 5 stars' into a float, or None"""
+    if not isinstance(rating_text, str):
+        return None
+    match = re.search(r"\d+(?:\.\d+)?", rating_text)
+    return float(match.group(0)) if match else None
+
+
+def parse_review_count(reviews_text):
+    """Parse a review count like '1,234' or '(2.5K)' into an int, or None"""
+    if not isinstance(reviews_text, str):
+        return None
+    match = re.search(r"(\d[\d,]*(?:\.\d+)?)\s*([KkMm]?)", reviews_text)
+    if not match:
+        return None
+    value = float(match.group(1).replace(",", ""))
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(match.group(2).lower(), 1)
+    return int(value * multiplier)
+
+
+def passes_filters(product, filters=None):
+    """Check a product against the configured rating, review and availability filters"""
+    if filters is None:
+        filters = FILTERS
+
+    rating = parse_rating(product.get("rating"))
+    if rating is None or rating < filters.get("min_rating", 0):
+        return False
+
+    reviews = parse_review_count(product.get("reviews"))
+    if reviews is None or reviews < filters.get("min_reviews", 0):
+        return False
+
+    # Search results rarely carry stock info; only filter when we have it
+    availability = product.get("availability")
+    if filters.get("availability") and isinstance(availability, str):
+        if "unavailable" in availability.lower() or "out of stock" in availability.lower():
+            return False
+
+    return True
+
+
+def open_archive(archive_dir=None, terms=None, sites=None, start_date=None, end_date=None):
+    """
+    Open the snapshot archive as a lazy frame.
+
+    Only snapshots matching the manifest filters are scanned, and files are
+    memory-mapped so selecting columns or rows afterwards reads nothing else.
+    """
+    import polars as pl
+    from scraper.archive import select_snapshots
+
+    paths = select_snapshots(archive_dir, terms=terms, sites=sites, start_date=start_date, end_date=end_date)
+    if not paths:
+        return pl.LazyFrame()
+    try:
+        return pl.scan_ipc(paths, memory_map=True)
+    except TypeError:
+        # Newer polars releases removed the memory_map flag
+        return pl.scan_ipc(paths)
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+import pandas as pd
+
+from scraper.archive import append_snapshot, read_snapshot
+from scraper.utils import open_archive
+
+
+def test_snapshot_round_trip(tmp_path):
+    df = pd.DataFrame([
+        {"site": "Amazon", "title": "Keyboard A", "price": "₹499", "link": "https://www.amazon.in/dp/B000000001",
+         "page": 1},
+        {"site": "Amazon", "title": "Keyboard B", "price": "₹999", "link": "https://www.amazon.in/dp/B000000002",
+         "page": 2},
+    ])
+    scraped_at = datetime(2026, 1, 2, 3, 4, 5)
+    first = append_snapshot(df, "usb keyboard", archive_dir=str(tmp_path), scraped_at=scraped_at)
+    second = append_snapshot(df, "usb keyboard", archive_dir=str(tmp_path), scraped_at=scraped_at)
+    append_snapshot(df.head(1), "mouse", archive_dir=str(tmp_path), scraped_at=scraped_at)
+
+    # Snapshots taken in the same instant must not overwrite each other
+    assert first["path"] != second["path"]
+    assert read_snapshot(str(tmp_path / first["path"])).num_rows == 2
+
+    frame = open_archive(str(tmp_path), terms=["usb keyboard"]).collect()
+    assert frame.height == 4
+    assert set(frame["search_term"]) == {"usb keyboard"}
+    assert sorted(frame["page"].to_list()) == [1, 1, 2, 2]
+    assert open_archive(str(tmp_path), terms=["missing"]).collect().height == 0